@@ -1,7 +1,52 @@
 from django.contrib import admin
-from .models import BlogPost, Comment, Like
+from core.reactions import set_reaction
+from .models import BlogPost, Comment, Like, move_comments_count
 
-# Simple admin registration
-admin.site.register(BlogPost)
-admin.site.register(Comment)
-admin.site.register(Like)
\ No newline at end of file
+
+@admin.register(BlogPost)
+class BlogPostAdmin(admin.ModelAdmin):
+    # Counters move by F() updates; a form save would write back a stale value
+    readonly_fields = ('likes_count', 'comments_count', 'views_count')
+
+
+@admin.register(Like)
+class LikeAdmin(admin.ModelAdmin):
+    """Likes are made through the API; deleting one here withdraws it like the API does"""
+    list_display = ('__str__', 'created_at')
+    list_select_related = ('user', 'blog_post')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        set_reaction(Like, 'blog_post', 'likes_count', obj.user, obj.blog_post_id, False)
+
+    def delete_queryset(self, request, queryset):
+        for like in queryset.select_related('user'):
+            self.delete_model(request, like)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'is_approved', 'created_at')
+    list_filter = ('is_approved',)
+    list_select_related = ('user', 'blog_post')
+    # Moderation goes through the actions so BlogPost.comments_count follows
+    readonly_fields = ('is_approved',)
+    actions = ('approve_comments', 'hide_comments')
+
+    @admin.action(description='Approve selected comments')
+    def approve_comments(self, request, queryset):
+        self.message_user(request, f'{queryset.set_approved(True)} comment(s) approved.')
+
+    @admin.action(description='Hide selected comments')
+    def hide_comments(self, request, queryset):
+        self.message_user(request, f'{queryset.set_approved(False)} comment(s) hidden.')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change and obj.is_approved:
+            move_comments_count([(obj.blog_post_id, 1)], 1)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AwarenessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'awareness'
+
+    def ready(self):
+        from core.cache import track_versions
+        from core.images import track_image_variants
+        from core.reactions import track_user_deletes
+        from .models import BlogPost, Comment, Like
+        track_versions(BlogPost, Comment, Like)
+        track_user_deletes(Like, 'blog_post', 'likes_count')
+        track_user_deletes(Comment, 'blog_post', 'comments_count', is_approved=True)
+        track_image_variants(BlogPost, 'featured_image')
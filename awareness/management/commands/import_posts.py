@@ -0,0 +1,10 @@
+from awareness.models import BlogPost
+from awareness.serializers import BlogPostImportSerializer
+from core.importing import BulkImportCommand
+
+
+class Command(BulkImportCommand):
+    help = 'Bulk import blog posts from CSV or JSON Lines; `author` is a username'
+    model = BlogPost
+    serializer_class = BlogPostImportSerializer
+    user_field = 'author'
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:04
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_likes_count(apps, schema_editor):
+    BlogPost = apps.get_model('awareness', 'BlogPost')
+    Like = apps.get_model('awareness', 'Like')
+    counts = Like.objects.filter(blog_post=OuterRef('pk')).order_by().values('blog_post').annotate(
+        total=Count('pk')
+    ).values('total')
+    BlogPost.objects.update(likes_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awareness', '0002_blogpost_blogpost_created_id_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Likes'),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['likes_count', 'id'], name='blogpost_likes_id_idx'),
+        ),
+    ]
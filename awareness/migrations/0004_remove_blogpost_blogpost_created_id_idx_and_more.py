@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awareness', '0003_blogpost_likes_count_blogpost_blogpost_likes_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blogpost_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blogpost_likes_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_post_created_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id'], name='blogpost_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['likes_count', 'id'], name='blogpost_published_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['blog_post', 'created_at', 'id'], name='comment_approved_post_idx'),
+        ),
+    ]
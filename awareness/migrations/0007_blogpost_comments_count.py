@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comments_count(apps, schema_editor):
+    BlogPost = apps.get_model('awareness', 'BlogPost')
+    Comment = apps.get_model('awareness', 'Comment')
+    counts = Comment.objects.filter(blog_post=OuterRef('pk'), is_approved=True).order_by().values(
+        'blog_post'
+    ).annotate(total=Count('pk')).values('total')
+    BlogPost.objects.update(comments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awareness', '0006_like_like_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Comments'),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,19 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Value
 from django.conf import settings
+from django.utils import timezone
+
+from core.cache import bump_version
+
+class BlogPostQuerySet(models.QuerySet):
+    def with_engagement_stats(self, user=None):
+        """Annotate the approved comment_count and the viewer's is_liked state"""
+        queryset = self.select_related('author').annotate(comment_count=F('comments_count'))
+        if user is not None and user.is_authenticated:
+            return queryset.annotate(is_liked=Exists(
+                Like.objects.filter(blog_post=OuterRef('pk'), user=user)
+            ))
+        return queryset.annotate(is_liked=Value(False))
 
 class BlogPost(models.Model):
     CATEGORY_CHOICES = [
@@ -20,6 +34,8 @@ class BlogPost(models.Model):
     
     # Media
     featured_image = models.ImageField(upload_to='blog_images/', blank=True, null=True, verbose_name="Featured Image")
+    # Downscaled WebP/JPEG copies of the featured image - see core/images.py
+    featured_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Status
     is_published = models.BooleanField(default=False, verbose_name="Publish Post")
@@ -27,12 +43,19 @@ class BlogPost(models.Model):
     
     # Statistics
     views_count = models.PositiveIntegerField(default=0, verbose_name="Views")
+    # Maintained by like_blog_post; `manage.py repair_counters` fixes drift
+    likes_count = models.PositiveIntegerField(default=0, verbose_name="Likes")
+    # Approved comments; maintained by CommentSerializer.create and
+    # Comment.objects.set_approved(), `manage.py repair_counters` fixes drift
+    comments_count = models.PositiveIntegerField(default=0, verbose_name="Comments")
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
 
+    objects = BlogPostQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -40,6 +63,50 @@ class BlogPost(models.Model):
         verbose_name = "Blog Post"
         verbose_name_plural = "Blog Posts"
         ordering = ['-created_at']
+        # Partial indexes over published posts; (key, id) doubles as the keyset seek key
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'], condition=Q(is_published=True),
+                name='blogpost_published_created_idx',
+            ),
+            # "Most liked" ordering
+            models.Index(
+                fields=['likes_count', 'id'], condition=Q(is_published=True),
+                name='blogpost_published_likes_idx',
+            ),
+        ]
+
+def _approved_per_post(comments):
+    return list(comments.order_by().values('blog_post').annotate(total=Count('pk')).values_list('blog_post', 'total'))
+
+def move_comments_count(per_post, sign):
+    """Add sign * total to comments_count for each (blog_post_id, total)"""
+    for blog_post_id, total in per_post:
+        BlogPost.objects.filter(pk=blog_post_id).update(comments_count=F('comments_count') + sign * total)
+
+class CommentQuerySet(models.QuerySet):
+    def set_approved(self, approved):
+        """
+        Approve or hide these comments for moderation, moving each post's
+        comments_count by the rows that actually changed. Returns that number.
+        """
+        with transaction.atomic():
+            changing = self.exclude(is_approved=approved)
+            per_post = _approved_per_post(changing)
+            changed = changing.update(is_approved=approved, updated_at=timezone.now())
+            move_comments_count(per_post, 1 if approved else -1)
+        if changed:
+            # update() sends no post_save
+            bump_version(Comment)
+            bump_version(BlogPost)
+        return changed
+
+    def delete(self):
+        with transaction.atomic():
+            per_post = _approved_per_post(self.filter(is_approved=True))
+            deleted = super().delete()
+            move_comments_count(per_post, -1)
+        return deleted
 
 class Comment(models.Model):
     blog_post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='comments')
@@ -50,13 +117,29 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CommentQuerySet.as_manager()
+
     def __str__(self):
         return f"Comment by {self.user} on {self.blog_post}"
 
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            if self.is_approved:
+                move_comments_count([(self.blog_post_id, 1)], -1)
+        return deleted
+
     class Meta:
         verbose_name = "Comment"
         verbose_name_plural = "Comments"
         ordering = ['-created_at']
+        indexes = [
+            # CommentListView: approved comments of one post, newest first
+            models.Index(
+                fields=['blog_post', 'created_at', 'id'], condition=Q(is_approved=True),
+                name='comment_approved_post_idx',
+            ),
+        ]
 
 class Like(models.Model):
     blog_post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='likes')
@@ -67,6 +150,10 @@ class Like(models.Model):
         unique_together = ['blog_post', 'user']
         verbose_name = "Like"
         verbose_name_plural = "Likes"
+        indexes = [
+            # Incremental exports (?updated_since=)
+            models.Index(fields=['created_at', 'id'], name='like_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} likes {self.blog_post.title}"
\ No newline at end of file
@@ -1,24 +1,31 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import BlogPost, Comment, Like
+from .models import BlogPost, Comment, Like, move_comments_count
+from core.serializers import ImageVariantsField, ImportedUserField
 
 class BlogPostSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
-    like_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(source='likes_count', read_only=True)
     comment_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
+    featured_image_variants = ImageVariantsField()
+    # Method fields backed by a same-named queryset annotation (core/fastpath.py)
+    annotated_fields = ('comment_count', 'is_liked')
     
     class Meta:
         model = BlogPost
-        fields = '__all__'
+        exclude = ('likes_count', 'comments_count')
         read_only_fields = ('author', 'views_count')
     
-    def get_like_count(self, obj):
-        return obj.likes.count()
-    
     def get_comment_count(self, obj):
-        return obj.comments.count()
+        # Annotated by BlogPost.objects.with_engagement_stats() on the list/detail views
+        if hasattr(obj, 'comment_count'):
+            return obj.comment_count
+        return obj.comments_count
     
     def get_is_liked(self, obj):
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Like.objects.filter(blog_post=obj, user=request.user).exists()
@@ -28,17 +35,28 @@ class BlogPostSerializer(serializers.ModelSerializer):
         validated_data['author'] = self.context['request'].user
         return super().create(validated_data)
 
+class BlogPostImportSerializer(BlogPostSerializer):
+    """Row validation for `manage.py import_posts`: the author is named in the row"""
+    author = ImportedUserField()
+
+    class Meta(BlogPostSerializer.Meta):
+        read_only_fields = ('views_count',)
+
 class CommentSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
         model = Comment
         fields = '__all__'
-        read_only_fields = ('user', 'is_approved')
+        read_only_fields = ('blog_post', 'user', 'is_approved')
     
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
+        with transaction.atomic():
+            comment = super().create(validated_data)
+            if comment.is_approved:
+                move_comments_count([(comment.blog_post_id, 1)], 1)
+        return comment
 
 class LikeSerializer(serializers.ModelSerializer):
     class Meta:
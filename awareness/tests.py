@@ -1,3 +1,163 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from users.models import CustomUser
+from .models import BlogPost, Comment, Like
+
+
+def make_post(author, **kwargs):
+    defaults = {
+        'title': 'Know your rights',
+        'content': 'Content',
+        'author': author,
+        'is_published': True,
+    }
+    defaults.update(kwargs)
+    return BlogPost.objects.create(**defaults)
+
+
+class BlogPostListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.author = CustomUser.objects.create_user(username='author', password='pass12345')
+        self.reader = CustomUser.objects.create_user(username='reader', password='pass12345')
+
+    def add_posts(self, count):
+        for i in range(count):
+            post = make_post(self.author, title=f'Post {i}', likes_count=1 + i % 2, comments_count=1)
+            Like.objects.create(user=self.author, blog_post=post)
+            Comment.objects.create(user=self.author, blog_post=post, content='Approved')
+            Comment.objects.create(user=self.reader, blog_post=post, content='Hidden', is_approved=False)
+            if i % 2:
+                Like.objects.create(user=self.reader, blog_post=post)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('blogpost-list'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.client.force_authenticate(self.reader)
+        self.add_posts(2)
+        small = self.count_list_queries()
+        self.add_posts(10)
+        self.assertEqual(self.count_list_queries(), small)
+
+    def test_list_counts_only_approved_comments(self):
+        self.add_posts(2)
+        self.client.force_authenticate(self.reader)
+        response = self.client.get(reverse('blogpost-list'))
+        rows = {row['title']: row for row in response.json()['results']}
+        self.assertEqual(rows['Post 0']['comment_count'], 1)
+        self.assertEqual(rows['Post 0']['like_count'], 1)
+        self.assertFalse(rows['Post 0']['is_liked'])
+        self.assertEqual(rows['Post 1']['like_count'], 2)
+        self.assertTrue(rows['Post 1']['is_liked'])
+        self.assertEqual(rows['Post 1']['author_name'], 'author')
+
+
+class LikeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = CustomUser.objects.create_user(username='reader', password='pass12345')
+        self.client.force_authenticate(self.reader)
+        self.post = make_post(self.reader)
+
+    def test_put_and_delete_are_idempotent(self):
+        url = reverse('like-blogpost', args=[self.post.pk])
+        for method, liked, count in (('put', True, 1), ('put', True, 1), ('delete', False, 0), ('delete', False, 0)):
+            self.assertEqual(getattr(self.client, method)(url).json(), {'liked': liked})
+            self.post.refresh_from_db()
+            self.assertEqual(self.post.likes_count, count)
+        self.assertEqual(self.client.put(reverse('like-blogpost', args=[self.post.pk + 1])).status_code, 404)
+
+    def test_post_still_toggles(self):
+        url = reverse('like-blogpost', args=[self.post.pk])
+        self.assertEqual(self.client.post(url).json(), {'message': 'Post liked successfully'})
+        self.assertEqual(self.client.post(url).json(), {'message': 'Post like removed'})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertFalse(Like.objects.exists())
+
+
+class CommentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.reader = CustomUser.objects.create_user(username='reader', password='pass12345')
+        self.client.force_authenticate(self.reader)
+        self.post = make_post(self.reader)
+        self.url = reverse('comment-list', args=[self.post.pk])
+
+    def assert_count(self, expected):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, expected)
+        self.assertEqual(self.post.comments.filter(is_approved=True).count(), expected)
+
+    def test_create_and_moderation_maintain_count(self):
+        for i in range(3):
+            self.assertEqual(self.client.post(self.url, {'content': f'Comment {i}'}).status_code, 201)
+        self.assert_count(3)
+
+        comments = Comment.objects.filter(blog_post=self.post)
+        self.assertEqual(comments.filter(content='Comment 0').set_approved(False), 1)
+        self.assertEqual(comments.set_approved(False), 2)
+        self.assert_count(0)
+        self.assertEqual(comments.filter(content='Comment 0').set_approved(True), 1)
+        self.assert_count(1)
+        comments.filter(content='Comment 0').get().delete()
+        self.assert_count(0)
+
+        out = StringIO()
+        call_command('repair_counters', '--check', stdout=out)
+        self.assertIn('Counters are in sync', out.getvalue())
+
+    def test_deleting_a_user_releases_their_likes_and_comments(self):
+        other = CustomUser.objects.create_user(username='other', password='pass12345')
+        self.client.post(self.url, {'content': 'Mine'})
+        self.client.put(reverse('like-blogpost', args=[self.post.pk]))
+        self.client.force_authenticate(other)
+        self.client.post(self.url, {'content': 'Theirs'})
+        self.client.put(reverse('like-blogpost', args=[self.post.pk]))
+
+        other.delete()
+        self.assert_count(1)
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_list_is_paginated_with_user_joined(self):
+        Comment.objects.bulk_create(
+            Comment(blog_post=self.post, user=self.reader, content=f'Comment {i}') for i in range(5)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual([row['user_name'] for row in response.json()['results']], ['reader', 'reader'])
+        self.assertIsNotNone(response.json()['next'])
+
+
+class ImportPostsTests(TestCase):
+    def test_jsonl_rows_are_imported_and_bad_rows_rejected(self):
+        CustomUser.objects.create_user(username='writer', password='pass12345')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'posts.jsonl')
+            with open(path, 'w') as source:
+                source.write(json.dumps({'title': 'Know your rights', 'content': 'Body', 'author': 'writer',
+                                         'category': 'legal_rights', 'is_published': True}) + '\n')
+                source.write('{not json\n')
+                source.write(json.dumps({'title': 'No author', 'content': 'Body'}) + '\n')
+            call_command('import_posts', path, stdout=StringIO())
+            with open(f'{path}.rejects.jsonl') as rejects:
+                rejected = [json.loads(line) for line in rejects]
 
-# Create your tests here.
+        post = BlogPost.objects.get()
+        self.assertEqual((post.title, post.author.username, post.is_published), ('Know your rights', 'writer', True))
+        self.assertEqual([r['line'] for r in rejected], [2, 3])
+        self.assertIn('author', rejected[1]['errors'])
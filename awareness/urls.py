@@ -6,4 +6,5 @@ urlpatterns = [
     path('posts/<int:pk>/', views.BlogPostDetailView.as_view(), name='blogpost-detail'),
     path('posts/<int:blog_post_id>/comments/', views.CommentListView.as_view(), name='comment-list'),
     path('posts/<int:blog_post_id>/like/', views.like_blog_post, name='like-blogpost'),
+    path('likes/export/', views.export_likes, name='like-export'),
 ]
\ No newline at end of file
@@ -1,12 +1,24 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from core.cache import VersionedCacheMixin
+from core.conditional import ConditionalRetrieveMixin
+from core.exports import export_response
+from core.fastpath import FastListMixin
+from core.reactions import set_reaction
+from core.viewcounts import record_view
 from .models import BlogPost, Comment, Like
 from .serializers import BlogPostSerializer, CommentSerializer, LikeSerializer
 
-class BlogPostListView(generics.ListCreateAPIView):
+class BlogPostListView(VersionedCacheMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = BlogPost.objects.filter(is_published=True)
     serializer_class = BlogPostSerializer
+    cache_models = [BlogPost, Like, Comment]
+    keyset_ordering_fields = ['created_at', 'likes_count']
+    
+    def get_queryset(self):
+        return super().get_queryset().with_engagement_stats(self.request.user)
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -16,40 +28,68 @@ class BlogPostListView(generics.ListCreateAPIView):
     def get_serializer_context(self):
         return {'request': self.request}
 
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
     permission_classes = [permissions.AllowAny]
+    etag_fields = [
+        'pk', 'updated_at', 'views_count', 'likes_count', 'comment_count', 'is_liked',
+        'featured_image_variants', 'author.username',
+    ]
+    
+    def get_queryset(self):
+        return super().get_queryset().with_engagement_stats(self.request.user)
+    
+    def get_object(self):
+        blog_post = super().get_object()
+        record_view(blog_post)
+        return blog_post
     
     def get_serializer_context(self):
         return {'request': self.request}
 
-class CommentListView(generics.ListCreateAPIView):
+class CommentListView(FastListMixin, generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
+        # The serializer fallback reads user.username; the fast path joins it in values()
         return Comment.objects.filter(
             blog_post_id=self.kwargs['blog_post_id'],
             is_approved=True
-        )
+        ).select_related('user')
+    
+    def perform_create(self, serializer):
+        serializer.save(blog_post=get_object_or_404(BlogPost, pk=self.kwargs['blog_post_id']))
     
     def get_serializer_context(self):
         return {'request': self.request}
 
-@api_view(['POST'])
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def like_blog_post(request, blog_post_id):
-    try:
-        blog_post = BlogPost.objects.get(id=blog_post_id)
-        like, created = Like.objects.get_or_create(
-            user=request.user,
-            blog_post=blog_post
-        )
-        if created:
-            return Response({'message': 'Post liked successfully'})
-        else:
-            like.delete()
+    """
+    PUT likes the post and DELETE removes the like; both are idempotent and
+    answer with the resulting state. POST toggles, for older clients.
+    """
+    if request.method == 'POST':
+        changed = set_reaction(Like, 'blog_post', 'likes_count', request.user, blog_post_id, True)
+        if changed is False:
+            set_reaction(Like, 'blog_post', 'likes_count', request.user, blog_post_id, False)
             return Response({'message': 'Post like removed'})
-    except BlogPost.DoesNotExist:
-        return Response({'error': 'Blog post not found'}, status=404)
\ No newline at end of file
+        if changed:
+            return Response({'message': 'Post liked successfully'})
+    else:
+        liked = request.method == 'PUT'
+        if set_reaction(Like, 'blog_post', 'likes_count', request.user, blog_post_id, liked) is not None:
+            return Response({'liked': liked})
+    return Response({'error': 'Blog post not found'}, status=404)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def export_likes(request):
+    """Stream every like as NDJSON or CSV - see core/exports.py"""
+    fields = {'id': 'id', 'blog_post_id': 'blog_post_id', 'user_id': 'user_id', 'created_at': 'created_at'}
+    return export_response(request, Like.objects.all(), fields, 'created_at', 'likes')
+
+export_likes.batchable = False  # streams its body; see core/batch.py
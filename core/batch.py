@@ -0,0 +1,125 @@
+"""
+Several API GETs in one HTTP call.
+
+A batch is a list of API paths ("/api/protests/5/", "/api/awareness/posts/3/
+comments/?page_size=5"). Each one is resolved and dispatched straight to its
+view as a GET, without another trip through the middleware stack. The caller
+is authenticated once for the batch. Sub-requests carry that user and token
+as DRF forced authentication, so no view looks up the token again.
+
+Sub-requests run one after another on the request's own DB connection when
+the backend serialises connections anyway (SQLite) or a transaction is open,
+since other threads would not see its writes. Otherwise they are spread over
+a small thread pool; each worker closes its connection after its sub-request.
+"""
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.datastructures import MultiValueDict
+
+DEFAULTS = {
+    'MAX_REQUESTS': 10,   # sub-requests allowed in one batch
+    'MAX_WORKERS': 4,     # threads used when sub-requests can run in parallel
+    'PATH_PREFIX': '/api/',
+}
+
+
+def options():
+    return {**DEFAULTS, **getattr(settings, 'BATCH_REQUESTS', {})}
+
+
+class BatchError(ValueError):
+    """A batch that can't be run at all"""
+
+
+def resolve_path(url):
+    """(resolver match, path, query string) for a batchable API path"""
+    if not isinstance(url, str):
+        raise BatchError('Each request must be a path string')
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+    if parts.scheme or parts.netloc or not path.startswith(options()['PATH_PREFIX']):
+        raise BatchError(f'Only {options()["PATH_PREFIX"]} paths can be batched: {url}')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None, path, parts.query
+    if getattr(match.func, 'batchable', True) is False or iscoroutinefunction(match.func):
+        # Streams and nested batches have no single body to embed
+        raise BatchError(f'{url} cannot be batched')
+    return match, path, parts.query
+
+
+def sub_request(request, path, query_string):
+    """A GET copy of the Django request for path, authenticated as request.user"""
+    sub = copy.copy(request._request)
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items()
+        # The batch's validators and body don't belong to its parts
+        if key not in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query_string)
+    # request.headers is cached from the batch's META
+    sub.__dict__.pop('headers', None)
+    sub.GET = QueryDict(query_string)
+    sub._post, sub._files = QueryDict(), MultiValueDict()
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def body_of(response):
+    if hasattr(response, 'data'):
+        return response.data
+    if response.get('Content-Type', '').startswith('application/json') and response.content:
+        return json.loads(response.content)
+    return response.content.decode(response.charset or 'utf-8')
+
+
+def dispatch(request, match, path, query_string):
+    if match is None:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    sub = sub_request(request, path, query_string)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Http404:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    if response.streaming:
+        # Views that stream are marked batchable = False; this catches unmarked ones
+        # before their iterator holds a cursor open
+        response.close()
+        return {'status': 400, 'body': {'detail': 'Streaming responses cannot be batched.'}}
+    return {'status': response.status_code, 'body': body_of(response)}
+
+
+def _dispatch_in_thread(*args):
+    try:
+        return dispatch(*args)
+    finally:
+        # Each worker thread opened its own connection
+        connection.close()
+
+
+def run_batch(request, urls):
+    """Responses for urls, in order"""
+    limit = options()['MAX_REQUESTS']
+    if not isinstance(urls, list) or not urls or len(urls) > limit:
+        raise BatchError(f'requests must be a list of 1 to {limit} paths')
+    # Resolve everything first so a bad path fails the batch before any view runs
+    resolved = [resolve_path(url) for url in urls]
+
+    workers = min(options()['MAX_WORKERS'], len(resolved))
+    if workers <= 1 or connection.vendor == 'sqlite' or connection.in_atomic_block:
+        return [dispatch(request, *target) for target in resolved]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as pool:
+        return list(pool.map(lambda target: _dispatch_in_thread(request, *target), resolved))
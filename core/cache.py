@@ -0,0 +1,108 @@
+"""
+Versioned response cache for public list endpoints.
+
+Each tracked model has a version number in the cache, bumped once a transaction
+that saved or deleted one of its rows commits. Cached responses embed the versions of the models they were built
+from in their key, so a write only orphans the entries that depend on the
+written model; they are never looked up again and age out via the timeout.
+Only cache add/get/incr are used, so any Django cache backend works.
+
+The same versions make the list ETag: a client revalidating with
+If-None-Match gets a 304 without the view touching the database.
+"""
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import urlencode
+from rest_framework.response import Response
+
+from .conditional import conditional_response, make_etag
+
+VERSION_KEY_PREFIX = 'cache-version'
+RESPONSE_KEY_PREFIX = 'response'
+
+
+def version_key(model):
+    return f'{VERSION_KEY_PREFIX}:{model._meta.label_lower}'
+
+
+def get_versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed from the clock so an evicted version never restarts at a
+            # number that older, still-cached responses were keyed with
+            seed = time.time_ns()
+            cache.add(key, seed, timeout=None)
+            versions[key] = cache.get(key, seed)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _bump_sender_version(sender, **kwargs):
+    # After commit: bumped any earlier, a concurrent reader could cache the
+    # pre-commit rows under the new version, where they'd stay until the next write
+    transaction.on_commit(partial(bump_version, sender))
+
+
+def track_versions(*models):
+    """Bump a model's cache version whenever one of its rows is saved or deleted"""
+    for model in models:
+        post_save.connect(_bump_sender_version, sender=model, dispatch_uid=f'cache-version-save-{model._meta.label}')
+        post_delete.connect(_bump_sender_version, sender=model, dispatch_uid=f'cache-version-delete-{model._meta.label}')
+
+
+def normalized_params(query_params):
+    """Sorted, blank-free query string so ?city=&cause=x and ?cause=x share an entry"""
+    items = sorted((key, value) for key, values in query_params.lists() for value in values if value != '')
+    return urlencode(items)
+
+
+class VersionedCacheMixin:
+    """
+    Serve anonymous GET list responses from the cache.
+
+    `cache_models` lists every model the response is built from; a write to
+    any of them invalidates this view's entries and nothing else.
+    """
+    cache_models = ()
+
+    def get_cache_key(self, request, versions):
+        # Host is part of the key because pagination links are absolute
+        material = f'{request.get_host()}?{normalized_params(request.query_params)}'
+        digest = hashlib.sha1(material.encode('utf-8')).hexdigest()
+        return f'{RESPONSE_KEY_PREFIX}:{self.__class__.__name__}:{versions}:{digest}'
+
+    def list(self, request, *args, **kwargs):
+        versions = ':'.join(str(version) for version in get_versions(self.cache_models))
+        key = self.get_cache_key(request, versions)
+        # Authenticated bodies carry per-user flags (is_supported, is_liked)
+        etag = make_etag(key, request.user.pk)
+        return conditional_response(request, etag, lambda: self.cached_list(request, key, *args, **kwargs))
+
+    def cached_list(self, request, key, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+            response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,63 @@
+"""
+ETag validators for conditional GETs.
+
+A response's ETag hashes exactly the values its body is rendered from, so a
+client that sends the ETag back in If-None-Match gets an empty 304 instead
+of a re-serialized body when nothing it would see has changed.
+
+Last-Modified isn't sent: the counters (views, supporters, likes, comments)
+change without touching updated_at, so a date alone can't validate a body.
+"""
+import hashlib
+from operator import attrgetter
+
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha1(repr(parts).encode('utf-8')).hexdigest())
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return etags == ['*'] or etag in {tag.removeprefix('W/') for tag in etags}
+
+
+def conditional_response(request, etag, render):
+    """304 if the client already has etag, otherwise render(); validator headers on both"""
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = render()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+    response['ETag'] = etag
+    # Stored by the browser but revalidated on every use; bodies differ per user
+    patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    ETag/304 for RetrieveAPIView. `etag_fields` names the attributes (dotted
+    paths and queryset annotations allowed) that determine the serialized
+    body; they are read from the object get_object() already fetched, so a
+    304 costs that one query and no serialization.
+    """
+    etag_fields = ()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = make_etag(
+            instance._meta.label, sorted(request.query_params.lists()),
+            *(attrgetter(field)(instance) for field in self.etag_fields),
+        )
+        return conditional_response(request, etag, lambda: Response(self.get_serializer(instance).data))
@@ -0,0 +1,257 @@
+"""
+Read-only fast path for list endpoints.
+
+Rendering a page through a ModelSerializer builds the serializer and its
+fields, a model instance per row, then walks each field through
+get_attribute() and to_representation(). compile_plan() does the field
+resolution once per serializer class and fieldset: every field becomes a
+.values() lookup plus a converter that returns exactly what the field's
+to_representation() would (identity for text, integer and boolean columns,
+storage URLs for files, datetimes formatted with the timezone resolved once
+per page, the field's own method for decimals and the like).
+FastListMixin then renders pages from .values() dicts.
+
+Method fields are only compiled when the serializer lists them in
+`annotated_fields`: their get_<field>() must return the same-named queryset
+annotation when it is present. Anything a plan can't reproduce exactly
+(custom fields, nested serializers, a nullable relation followed by a source)
+makes the view fall back to the serializer, so the body never depends on
+which path produced it.
+"""
+import threading
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .serializers import ImageVariantsField, render_variants
+
+PLAN_CACHE_SIZE = 256
+
+# Serializer fields whose to_representation() returns a column value of the
+# paired model field types unchanged
+IDENTITY_FIELDS = (
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.ChoiceField, (models.CharField, models.IntegerField)),
+    (serializers.IntegerField, (models.IntegerField,)),
+    (serializers.BooleanField, (models.BooleanField,)),
+)
+# Serializer fields whose to_representation() doesn't read the context, so a
+# compiled plan can call it directly
+CONTEXT_FREE_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField, serializers.BigIntegerField,
+    serializers.BooleanField, serializers.FloatField, serializers.DecimalField, serializers.DateField,
+    serializers.TimeField, serializers.DurationField, serializers.UUIDField, serializers.JSONField,
+)
+
+
+def _inherits_representation(field, base):
+    return isinstance(field, base) and type(field).to_representation is base.to_representation
+
+
+def _file_url(storage, use_url):
+    def factory(request):
+        def convert(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return convert
+    return factory
+
+
+def _datetime(field):
+    """DateTimeField.to_representation with the field's timezone looked up once per render"""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return lambda request: field.to_representation
+
+    def factory(request):
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+        def convert(value):
+            if field_timezone is None or not timezone.is_aware(value):
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return convert
+    return factory
+
+
+def _variants(request):
+    return lambda value: render_variants(*value, request)
+
+
+def _resolve_source(model, field):
+    """(values() lookup, model field) for field's source, or None if it isn't a column path"""
+    path, current, model_field = [], model, None
+    for attr in field.source_attrs:
+        if current is None:
+            return None
+        if model_field is not None and model_field.null:
+            # DRF skips the field when a nullable relation is empty; values() would give None
+            return None
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        path.append(attr)
+        current = model_field.related_model if model_field.is_relation else None
+    return '__'.join(path), model_field
+
+
+def _compile_field(model, field, annotated):
+    """(lookup, converter, request-bound?, annotation) for field, or None"""
+    if isinstance(field, serializers.SerializerMethodField):
+        if field.field_name not in annotated:
+            return None
+        return field.field_name, None, False, field.field_name
+    if field.source == '*':
+        return None
+    resolved = _resolve_source(model, field)
+    if resolved is None:
+        return None
+    lookup, model_field = resolved
+
+    if model_field.is_relation:
+        # values() gives the foreign key value, as PrimaryKeyRelatedField renders it
+        if (_inherits_representation(field, serializers.PrimaryKeyRelatedField)
+                and field.pk_field is None and not model_field.many_to_many):
+            return lookup, None, False, None
+        return None
+    if isinstance(field, serializers.RelatedField):
+        return None
+    if _inherits_representation(field, serializers.DateTimeField):
+        return lookup, _datetime(field), True, None
+    if _inherits_representation(field, ImageVariantsField):
+        # Rendered from (variants, image file name), as ImageVariantsField.get_attribute() reads them
+        if type(field).get_attribute is not ImageVariantsField.get_attribute:
+            return None
+        return (lookup, '__'.join(field.image_source_attrs)), _variants, True, None
+    if _inherits_representation(field, serializers.FileField):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        return lookup, _file_url(model_field.storage, use_url), True, None
+    if (_inherits_representation(field, serializers.BigIntegerField)
+            and not getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)):
+        return lookup, None, False, None
+    for serializer_type, column_types in IDENTITY_FIELDS:
+        if _inherits_representation(field, serializer_type) and isinstance(model_field, column_types):
+            return lookup, None, False, None
+    if any(_inherits_representation(field, base) for base in CONTEXT_FREE_FIELDS):
+        return lookup, field.to_representation, False, None
+    return None
+
+
+class ListPlan:
+    """The compiled representation of one serializer class and fieldset"""
+
+    def __init__(self, fields, mappers, annotations):
+        self.fields = fields
+        # None when some field can't be rendered from a values() row
+        self.mappers = mappers
+        self.annotations = annotations
+        # A field's lookup is one column, or a tuple of columns passed on as a tuple
+        self.lookups = tuple(dict.fromkeys(
+            column for _, lookup, _, _ in mappers or ()
+            for column in (lookup if isinstance(lookup, tuple) else (lookup,))
+        ))
+
+    def covers(self, queryset):
+        return self.mappers is not None and self.annotations <= queryset.query.annotations.keys()
+
+    def bind(self, request):
+        return [
+            (name, itemgetter(*lookup) if isinstance(lookup, tuple) else itemgetter(lookup),
+             convert(request) if per_request else convert)
+            for name, lookup, convert, per_request in self.mappers
+        ]
+
+    def render(self, rows, request=None):
+        mappers = self.bind(request)
+        data = []
+        for row in rows:
+            item = {}
+            for name, read, convert in mappers:
+                value = read(row)
+                # Like Serializer.to_representation, None is never converted
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+def compile_plan(serializer):
+    model = serializer.Meta.model
+    annotated = set(getattr(serializer, 'annotated_fields', ()))
+    fields, mappers, annotations = [], [], set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        fields.append(name)
+        compiled = mappers is not None and _compile_field(model, field, annotated)
+        if not compiled:
+            mappers = None
+            continue
+        lookup, convert, per_request, annotation = compiled
+        mappers.append((name, lookup, convert, per_request))
+        if annotation:
+            annotations.add(annotation)
+    return ListPlan(tuple(fields), mappers, frozenset(annotations))
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+class FastListMixin:
+    """
+    list() from .values() rows for GET list views. The plan is cached per
+    serializer class and ?fields=/?omit= selection, so a warm request builds
+    no serializer at all.
+    """
+    fast_list = True
+
+    def get_list_plan(self):
+        if not hasattr(self, '_list_plan'):
+            params = self.request.query_params
+            key = (self.get_serializer_class(), params.get('fields'), params.get('omit'))
+            plan = _plans.get(key)
+            if plan is None:
+                # Builds the serializer, so an invalid ?fields= raises here as usual
+                plan = compile_plan(self.get_serializer())
+                with _plans_lock:
+                    if len(_plans) >= PLAN_CACHE_SIZE:
+                        _plans.clear()
+                    _plans[key] = plan
+            self._list_plan = plan
+        return self._list_plan
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = self.get_list_plan()
+        if not (self.fast_list and plan.covers(queryset)):
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        columns = dict.fromkeys((*plan.lookups, *self.get_pagination_columns()))
+        rows = queryset.values(*columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page, request))
+        return Response(plan.render(rows, request))
+
+    def get_pagination_columns(self):
+        """Columns the paginator reads from rows to build its cursor"""
+        get_ordering = getattr(self.paginator, 'get_ordering', None)
+        if get_ordering is None:
+            return ()
+        return tuple(name.lstrip('-') for name in get_ordering(self.request, self))
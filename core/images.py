@@ -0,0 +1,149 @@
+"""
+Responsive derivatives of uploaded images.
+
+Uploads are kept as-is; alongside each tracked ImageField the model has a
+JSONField (`<field>_variants`) describing downscaled WebP and JPEG copies at
+VARIANT_WIDTHS. Variants are stored under the SHA-256 of the source bytes,
+so re-uploading the same file or re-running generation reuses what already
+exists. track_image_variants() hooks post_save to queue a background job
+(core/jobs.py) whenever the image changes, so uploads don't wait on Pillow;
+the `generate_image_variants` command backfills existing rows.
+
+The stored map looks like
+    {'source': 'protest_posters/a.jpg', 'width': 4032, 'height': 3024,
+     'webp': {'320': 'variants/ab/cdef.../320w.webp', ...}, 'jpeg': {...}}
+"""
+import hashlib
+import io
+import logging
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_save
+from PIL import Image, ImageOps
+
+from .cache import bump_version
+from .jobs import enqueue
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_ROOT = 'variants'
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 80, 'optimize': True, 'progressive': True}),
+}
+
+# model -> tracked ImageField names, filled by track_image_variants()
+tracked_models = {}
+
+
+def variant_widths(source_width):
+    """Target widths for an image; never upscales, always yields at least one"""
+    widths = [width for width in VARIANT_WIDTHS if width < source_width]
+    widths.append(min(source_width, VARIANT_WIDTHS[-1]))
+    return sorted(set(widths), reverse=True)
+
+
+def _encode(image, image_format, options):
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(field_file):
+    """
+    Build (or reuse) the variants of field_file and return the map to store.
+
+    Returns {} for an empty field and None if the file can't be read as an
+    image, in which case clients keep using the original.
+    """
+    if not field_file:
+        return {}
+    storage = field_file.storage
+    try:
+        with field_file.open('rb') as source:
+            content = source.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with Image.open(io.BytesIO(content)) as original:
+            image = ImageOps.exif_transpose(original)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+            source_width, source_height = image.size
+
+            variants = {'source': field_file.name, 'width': source_width, 'height': source_height}
+            variants.update({key: {} for key in FORMATS})
+            # Largest first, each step downscaling the previous one
+            for width in variant_widths(source_width):
+                height = max(1, round(source_height * width / source_width))
+                if image.size != (width, height):
+                    image = image.resize((width, height), Image.LANCZOS)
+                for key, (image_format, options) in FORMATS.items():
+                    name = f'{VARIANT_ROOT}/{digest[:2]}/{digest[2:]}/{width}w.{key}'
+                    if not storage.exists(name):
+                        name = storage.save(name, ContentFile(_encode(image, image_format, options)))
+                    variants[key][str(width)] = name
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning('Could not generate image variants for %s', field_file.name, exc_info=True)
+        return None
+    return variants
+
+
+def needs_refresh(instance, field_name):
+    field_file = getattr(instance, field_name)
+    current = getattr(instance, f'{field_name}_variants') or {}
+    return (field_file.name or None) != current.get('source') and bool(field_file or current)
+
+
+def refresh_variants(instance, field_name):
+    """Regenerate instance's variants for field_name if the image changed; True if saved"""
+    if not needs_refresh(instance, field_name):
+        return False
+    variants_field = f'{field_name}_variants'
+    field_file = getattr(instance, field_name)
+    variants = generate_variants(field_file)
+    if variants is None:
+        # Remember the failure so it isn't retried on every save
+        variants = {'source': field_file.name}
+    model = type(instance)
+    # update() rather than save(): no second round of signals, no updated_at bump
+    model._base_manager.filter(pk=instance.pk).update(**{variants_field: variants})
+    setattr(instance, variants_field, variants)
+    bump_version(model)
+    return True
+
+
+def refresh_variants_job(model, pk, field_name):
+    """Background job queued by track_image_variants()"""
+    instance = apps.get_model(model)._base_manager.filter(pk=pk).first()
+    if instance is not None:
+        refresh_variants(instance, field_name)
+
+
+def _post_save_handler(field_names):
+    def handler(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw:
+            return
+        for field_name in field_names:
+            if update_fields is not None and field_name not in update_fields:
+                continue
+            if needs_refresh(instance, field_name):
+                enqueue(refresh_variants_job, model=sender._meta.label_lower, pk=instance.pk, field_name=field_name)
+    return handler
+
+
+def track_image_variants(model, *field_names):
+    """Keep `<field>_variants` in step with each named ImageField of model"""
+    tracked_models[model] = field_names
+    post_save.connect(
+        _post_save_handler(field_names), sender=model, weak=False,
+        dispatch_uid=f'image-variants-{model._meta.label}',
+    )
@@ -0,0 +1,120 @@
+"""
+Streaming bulk import shared by `import_protests` and `import_posts`.
+
+Rows are read lazily from CSV or JSON Lines and processed in batches: the
+usernames a batch refers to are fetched in one query, each row is checked
+with the app's import serializer, and the valid rows are written with one
+bulk_create inside their own transaction. Only one batch is ever held in
+memory. Rows that fail validation go to a JSON Lines reject file with their
+line number and errors, so the file can be fixed and fed back in.
+
+bulk_create skips save() and signals, so subclasses fill in derived fields
+in build_instance() and the tracked cache versions are bumped once at the end.
+"""
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .cache import bump_version
+
+
+def read_csv(source):
+    reader = csv.DictReader(source)
+    for row in reader:
+        # Blank cells mean "not given", not an empty value to validate
+        yield reader.line_num, {key: value for key, value in row.items() if key and value != ''}
+
+
+def read_jsonl(source):
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, {'__invalid__': f'Invalid JSON: {exc}'}
+            continue
+        yield line_number, row if isinstance(row, dict) else {'__invalid__': 'Expected a JSON object'}
+
+
+READERS = {
+    'csv': read_csv,
+    'jsonl': read_jsonl,
+}
+
+
+class BulkImportCommand(BaseCommand):
+    model = None
+    serializer_class = None
+    # Column naming the owning user by username
+    user_field = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file to import')
+        parser.add_argument('--format', choices=sorted(READERS), help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows validated and written per transaction')
+        parser.add_argument('--rejects', help='Where to write rejected rows (default: <path>.rejects.jsonl)')
+
+    def get_serializer_context(self, options):
+        return {}
+
+    def build_instance(self, attrs):
+        return self.model(**attrs)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        rejects_path = options['rejects'] or f'{path}.rejects.jsonl'
+        batch_size = max(1, options['batch_size'])
+        context = self.get_serializer_context(options)
+        # One serializer validates every row, so its fields are built only once
+        validator = self.serializer_class(context=context)
+
+        created = rejected = 0
+        started = time.monotonic()
+        try:
+            source = open(path, newline='', encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        with source, open(rejects_path, 'w', encoding='utf-8') as rejects:
+            rows = READERS[input_format](source)
+            while batch := list(islice(rows, batch_size)):
+                context['users'] = self.fetch_users(batch)
+                instances = []
+                for line_number, row in batch:
+                    try:
+                        if '__invalid__' in row:
+                            raise ValidationError(row['__invalid__'])
+                        attrs = validator.run_validation(row)
+                    except ValidationError as exc:
+                        rejects.write(json.dumps({'line': line_number, 'row': row, 'errors': exc.detail}) + '\n')
+                        rejected += 1
+                        continue
+                    instances.append(self.build_instance(attrs))
+                with transaction.atomic():
+                    self.model.objects.bulk_create(instances)
+                created += len(instances)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'{created + rejected} rows read, {created} imported')
+
+        if created:
+            bump_version(self.model)
+        if not rejected:
+            os.remove(rejects_path)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {created} {self.model._meta.verbose_name_plural.lower()} in {elapsed:.1f}s'
+        ))
+        if rejected:
+            self.stdout.write(self.style.WARNING(f'Rejected {rejected} rows, see {rejects_path}'))
+
+    def fetch_users(self, batch):
+        usernames = {str(row[self.user_field]) for _, row in batch if row.get(self.user_field) is not None}
+        return get_user_model().objects.in_bulk(usernames, field_name='username')
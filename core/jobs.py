@@ -0,0 +1,145 @@
+"""
+Database-backed background jobs.
+
+enqueue() inserts a Job row naming a task by dotted path, in the caller's
+transaction, so a job exists if and only if the write that produced it was
+committed. `manage.py runworker` processes claim due jobs with a conditional
+UPDATE (status queued -> running); whichever worker's UPDATE matches the row
+owns it, so no locking primitives beyond the database are needed.
+
+A job whose task raises is put back with exponential backoff until it has
+used max_attempts, then left as failed for inspection in the admin. Jobs
+held by a worker that died are released again after LOCK_TIMEOUT seconds.
+Successful jobs are deleted. Tasks must therefore be idempotent.
+
+Configured through settings.JOB_QUEUE.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE': 10,
+    'BACKOFF_MAX': 3600,
+    'LOCK_TIMEOUT': 600,
+}
+
+
+def get_option(name):
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, DEFAULTS[name])
+
+
+def task_path(task):
+    if isinstance(task, str):
+        return task
+    return f'{task.__module__}.{task.__qualname__}'
+
+
+def enqueue(task, *, delay=0, max_attempts=None, **kwargs):
+    """
+    Queue task(**kwargs) to run in a worker. task is a module-level function or
+    its dotted path; kwargs must be JSON serializable.
+    """
+    return Job.objects.create(
+        task=task_path(task),
+        kwargs=kwargs,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or get_option('MAX_ATTEMPTS'),
+    )
+
+
+def backoff_seconds(attempts):
+    return min(get_option('BACKOFF_BASE') * 2 ** (attempts - 1), get_option('BACKOFF_MAX'))
+
+
+def claim_job(worker_id):
+    """Take ownership of the next due job, or return None if there is none"""
+    while True:
+        now = timezone.now()
+        candidate = (
+            Job.objects.filter(status=Job.STATUS_QUEUED, run_at__lte=now)
+            .order_by('run_at', 'id').values_list('pk', flat=True).first()
+        )
+        if candidate is None:
+            return None
+        claimed = Job.objects.filter(pk=candidate, status=Job.STATUS_QUEUED).update(
+            status=Job.STATUS_RUNNING, locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate)
+        # Another worker got there first; try the next one
+
+
+def release_stale_jobs():
+    """Requeue running jobs whose worker stopped without finishing them"""
+    cutoff = timezone.now() - timedelta(seconds=get_option('LOCK_TIMEOUT'))
+    return Job.objects.filter(status=Job.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Job.STATUS_QUEUED, locked_by='', locked_at=None,
+    )
+
+
+def run_job(job):
+    """Execute a claimed job and record the outcome; returns True on success"""
+    try:
+        task = import_string(job.task)
+        with transaction.atomic():
+            task(**job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error('Job %s (%s) failed permanently:\n%s', job.pk, job.task, error)
+            changes = {'status': Job.STATUS_FAILED}
+        else:
+            logger.warning('Job %s (%s) failed, attempt %s of %s', job.pk, job.task, job.attempts, job.max_attempts)
+            changes = {
+                'status': Job.STATUS_QUEUED,
+                'run_at': timezone.now() + timedelta(seconds=backoff_seconds(job.attempts)),
+            }
+        Job.objects.filter(pk=job.pk).update(locked_by='', locked_at=None, last_error=error, **changes)
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+class Worker:
+    def __init__(self, name=None, poll_interval=None):
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.poll_interval = get_option('POLL_INTERVAL') if poll_interval is None else poll_interval
+        self.stopping = False
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def work(self, burst=False):
+        """Process jobs until stop() is called, or until the queue is drained if burst"""
+        processed = 0
+        next_sweep = 0
+        while not self.stopping:
+            if time.monotonic() >= next_sweep:
+                release_stale_jobs()
+                next_sweep = time.monotonic() + get_option('LOCK_TIMEOUT') / 2
+            job = claim_job(self.name)
+            if job is None:
+                if burst:
+                    break
+                close_old_connections()
+                time.sleep(self.poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+        return processed
@@ -0,0 +1,100 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.utils.encoders import JSONEncoder
+
+from awareness.models import BlogPost, Comment
+from awareness.serializers import BlogPostSerializer, CommentSerializer
+from core.fastpath import compile_plan
+from protests.models import Protest
+from protests.serializers import ProtestListSerializer, ProtestSerializer
+from users.models import CustomUser
+
+SIZES = (100, 1000, 10000)
+
+
+class Command(BaseCommand):
+    help = 'Compare list rendering through ModelSerializer and the .values() fast path (data rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Row counts to render')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['sizes'])
+        rows = sizes[-1]
+        request = Request(APIRequestFactory().get('/', HTTP_HOST='localhost'))
+
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(username=f'bench-{time.time_ns()}')
+            start = timezone.now() + timedelta(days=1)
+            self.stdout.write(f'Generating {rows} protests, posts and comments...')
+            Protest.objects.bulk_create((
+                Protest(
+                    title=f'Protest {i}', description='Details of the march. ' * 30, cause='water',
+                    organizer=user, city='karachi', specific_location='Saddar', status='approved',
+                    latitude='24.860700', longitude='67.001100', poster=f'posters/{i}.jpg',
+                    start_datetime=start, end_datetime=start + timedelta(hours=2),
+                ) for i in range(rows)
+            ), batch_size=1000)
+            BlogPost.objects.bulk_create((
+                BlogPost(title=f'Post {i}', content='Body text. ' * 50, author=user, is_published=True,
+                         featured_image=f'blog_images/{i}.jpg')
+                for i in range(rows)
+            ), batch_size=1000)
+            post = BlogPost.objects.filter(author=user).first()
+            Comment.objects.bulk_create(
+                (Comment(blog_post=post, user=user, content=f'Comment {i}') for i in range(rows)), batch_size=1000,
+            )
+
+            cases = (
+                ('protests', ProtestListSerializer,
+                 Protest.objects.public().with_support_stats().with_summary()),
+                ('protests ?fields=', ProtestSerializer,
+                 Protest.objects.public().with_support_stats()),
+                ('posts', BlogPostSerializer,
+                 BlogPost.objects.filter(is_published=True).with_engagement_stats()),
+                ('comments', CommentSerializer,
+                 Comment.objects.filter(blog_post=post, is_approved=True)),
+            )
+            self.stdout.write(f"{'endpoint':<20}{'rows':>7}{'serializer rows/s':>20}{'fast rows/s':>14}{'speedup':>10}")
+            for label, serializer_class, queryset in cases:
+                context = {'request': request}
+                plan = compile_plan(serializer_class(context=context))
+                if not plan.covers(queryset):
+                    raise CommandError(f'{label}: the fast path does not cover {serializer_class.__name__}')
+                queryset = queryset.order_by('-created_at', '-id')
+                for size in sizes:
+                    def slow():
+                        return serializer_class(list(queryset[:size]), many=True, context=context).data
+
+                    def fast():
+                        return plan.render(list(queryset.values(*plan.lookups)[:size]), request)
+
+                    if self.encode(slow()) != self.encode(fast()):
+                        raise CommandError(f'{label}: fast path output differs from {serializer_class.__name__}')
+                    slow_rate = size / self.time(slow, options['repeat'])
+                    fast_rate = size / self.time(fast, options['repeat'])
+                    self.stdout.write(
+                        f'{label:<20}{size:>7}{slow_rate:>20,.0f}{fast_rate:>14,.0f}{fast_rate / slow_rate:>9.1f}x'
+                    )
+
+            transaction.set_rollback(True)
+
+    def encode(self, data):
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+
+    def time(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
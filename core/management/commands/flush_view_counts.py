@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import viewcounts
+
+
+class Command(BaseCommand):
+    help = "Write buffered views_count increments to the database (VIEW_COUNTER['BACKEND'] = 'cache' only)"
+
+    def handle(self, *args, **options):
+        if viewcounts.options()['BACKEND'] != 'cache':
+            # A 'memory' buffer belongs to the web worker; this process's is always empty
+            raise CommandError("flush_view_counts needs VIEW_COUNTER['BACKEND'] = 'cache'")
+        written = viewcounts.flush_views()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {written} buffered views'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.images import refresh_variants, tracked_models
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or stale responsive image variants for every tracked image field'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild variant maps even if they look up to date')
+
+    def handle(self, *args, **options):
+        for model, field_names in tracked_models.items():
+            refreshed = 0
+            for instance in model._base_manager.iterator(chunk_size=200):
+                for field_name in field_names:
+                    if options['force']:
+                        setattr(instance, f'{field_name}_variants', {})
+                    if refresh_variants(instance, field_name):
+                        refreshed += 1
+            self.stdout.write(f'{model._meta.label}: refreshed {refreshed} image(s)')
+        self.stdout.write(self.style.SUCCESS('Image variants are up to date'))
@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# (model, counter column, counted model, foreign key to model, extra filters)
+COUNTERS = [
+    ('protests.Protest', 'supporters_count', 'protests.Support', 'protest', {}),
+    ('awareness.BlogPost', 'likes_count', 'awareness.Like', 'blog_post', {}),
+    ('awareness.BlogPost', 'comments_count', 'awareness.Comment', 'blog_post', {'is_approved': True}),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare denormalized counter columns with the real row counts and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report drift; exit with an error if any counter is wrong',
+        )
+
+    def handle(self, *args, **options):
+        total_drift = 0
+        for model_label, field, counted_label, fk, filters in COUNTERS:
+            model = apps.get_model(model_label)
+            counted = apps.get_model(counted_label)
+            actual = counted.objects.filter(**{fk: OuterRef('pk')}, **filters).order_by().values(fk).annotate(
+                total=Count('pk')
+            ).values('total')
+            drifted = model.objects.order_by().annotate(
+                actual=Coalesce(Subquery(actual), 0)
+            ).exclude(**{field: F('actual')}).values_list('pk', field, 'actual')
+
+            repaired = 0
+            with transaction.atomic():
+                for pk, stored, real in drifted.iterator(chunk_size=500):
+                    self.stdout.write(f'{model_label}#{pk}.{field}: stored {stored}, actual {real}')
+                    if not options['check']:
+                        model.objects.filter(pk=pk).update(**{field: real})
+                    repaired += 1
+            total_drift += repaired
+            self.stdout.write(f'{model_label}.{field}: {repaired} drifted row(s)')
+
+        if options['check'] and total_drift:
+            raise CommandError(f'{total_drift} counter(s) out of sync')
+        self.stdout.write(self.style.SUCCESS('Counters are in sync' if not total_drift else f'Repaired {total_drift} counter(s)'))
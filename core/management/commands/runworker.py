@@ -0,0 +1,65 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import Worker
+
+
+def _run_worker(burst):
+    worker = Worker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.work(burst=burst)
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers (see core/jobs.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        burst = options['burst']
+        if processes == 1:
+            self.stdout.write('Worker started')
+            _run_worker(burst)
+            return
+
+        # Children inherit the parent's state by forking, so they must not share
+        # its database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        children = []
+
+        def start_child():
+            child = context.Process(target=_run_worker, args=(burst,), daemon=True)
+            child.start()
+            return child
+
+        def shutdown(*args):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        children.extend(start_child() for _ in range(processes))
+        self.stdout.write(f'Started {processes} worker processes')
+
+        try:
+            while any(child.is_alive() for child in children):
+                for index, child in enumerate(children):
+                    # Replace workers that died; in burst mode exiting is expected
+                    if not child.is_alive() and child.exitcode not in (0, -signal.SIGTERM) and not burst:
+                        self.stderr.write(f'Worker {child.pid} exited with {child.exitcode}, restarting')
+                        children[index] = start_child()
+                time.sleep(1)
+        finally:
+            shutdown()
+            for child in children:
+                child.join()
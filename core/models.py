@@ -0,0 +1,39 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Job(models.Model):
+    """A unit of background work, run by `manage.py runworker` - see core/jobs.py"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200, verbose_name="Task")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Arguments")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(verbose_name="Run At")
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+    class Meta:
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        ordering = ['run_at', 'id']
+        indexes = [
+            # Claim path: the next due queued job
+            models.Index(fields=['run_at', 'id'], condition=Q(status='queued'), name='job_queued_run_at_idx'),
+            # Stale-lock sweep
+            models.Index(fields=['locked_at'], condition=Q(status='running'), name='job_running_locked_idx'),
+        ]
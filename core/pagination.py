@@ -0,0 +1,116 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek pagination over a (key, id) pair.
+
+    The cursor carries the key and id of the last row on the page, so the next
+    page is a range read on an index over (key, id) instead of an OFFSET scan,
+    and costs the same at any depth.
+
+    Views may list `keyset_ordering_fields` to let `?ordering=` pick another
+    key (e.g. `-supporters_count`); each needs its own (key, id) index.
+    Querysets of .values() dicts must include the key and id columns.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        key, pk = self.get_ordering(request, view)
+        self.key_field = key.lstrip('-')
+        self.pk_field = pk.lstrip('-')
+        self.descending = key.startswith('-')
+
+        queryset = queryset.order_by(key, pk)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(*position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_ordering(self, request, view):
+        requested = request.query_params.get(self.ordering_query_param, '')
+        if requested.lstrip('-') in getattr(view, 'keyset_ordering_fields', ()):
+            return (requested, '-id' if requested.startswith('-') else 'id')
+        return getattr(view, 'keyset_ordering', self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def seek_filter(self, value, pk):
+        # key <= value narrows the index range; the OR only breaks ties inside it
+        lookup = 'lt' if self.descending else 'gt'
+        return (
+            Q(**{f'{self.key_field}__{lookup}e': value})
+            & (Q(**{f'{self.key_field}__{lookup}': value}) | Q(**{f'pk__{lookup}': pk}))
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw_value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            value = model._meta.get_field(self.key_field).to_python(raw_value)
+            if value is None or pk is None:
+                # Keys are never NULL, so no page can start after one
+                raise NotFound(self.invalid_cursor_message)
+            return value, int(pk)
+        except (TypeError, ValueError, OverflowError, ValidationError, UnicodeEncodeError):
+            # OverflowError: an infinite number (1e400) as key or id
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        # Rows are model instances, or dicts from a .values() queryset
+        if isinstance(row, dict):
+            value, pk = row[self.key_field], row[self.pk_field]
+        else:
+            value, pk = getattr(row, self.key_field), row.pk
+        raw_value = value.isoformat() if hasattr(value, 'isoformat') else value
+        payload = json.dumps([raw_value, pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,104 @@
+"""
+Idempotent per-user reactions (supports, likes).
+
+A reaction is a (user, target) row under a unique constraint plus a counter
+column on the target. set_reaction() changes the row with a single
+conditional statement: an INSERT ... SELECT from the target that does
+nothing on conflict, or a DELETE. The counter moves only if that statement
+changed a row, so repeated or concurrent requests can neither fail on the
+unique constraint nor count twice.
+
+update() and raw statements send no signals, so the reaction model's cache
+version (core/cache.py) is bumped here.
+
+Deleting a user cascades to their rows without going through set_reaction();
+track_user_deletes() takes those rows out of the counters first.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.db.models.signals import pre_delete
+from django.utils import timezone
+
+from .cache import bump_version
+
+
+def _insert_if_absent(model, target_field, user, target_id):
+    target = target_field.related_model
+    user_field = model._meta.get_field('user')
+    quote = connection.ops.quote_name
+    now = timezone.now()
+    # Remaining columns are creation timestamps
+    stamped = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    columns = [user_field.column, target_field.column, *(field.column for field in stamped)]
+    values = ['%s', quote(target._meta.pk.column), *('%s' for _ in stamped)]
+    params = [user.pk, *(field.get_db_prep_value(now, connection) for field in stamped), target_id]
+    with connection.cursor() as cursor:
+        # The WHERE also keeps SQLite from reading ON CONFLICT as a join constraint
+        cursor.execute(
+            f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)}) "
+            f"SELECT {', '.join(values)} FROM {quote(target._meta.db_table)} "
+            f"WHERE {quote(target._meta.pk.column)} = %s ON CONFLICT DO NOTHING",
+            params,
+        )
+        return cursor.rowcount == 1
+
+
+def _delete_if_present(model, target_field, user, target_id):
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} "
+            f"WHERE {quote(model._meta.get_field('user').column)} = %s AND {quote(target_field.column)} = %s",
+            [user.pk, target_id],
+        )
+        return cursor.rowcount == 1
+
+
+def set_reaction(model, target_name, counter, user, target_id, active):
+    """
+    Make user's reaction to target_id present (active) or absent. Returns True
+    if it changed, False if it was already in that state, None if the target
+    doesn't exist.
+    """
+    target_field = model._meta.get_field(target_name)
+    with transaction.atomic():
+        if active:
+            changed = _insert_if_absent(model, target_field, user, target_id)
+        else:
+            changed = _delete_if_present(model, target_field, user, target_id)
+        if changed:
+            target_field.related_model.objects.filter(pk=target_id).update(
+                **{counter: F(counter) + (1 if active else -1)}
+            )
+    if changed:
+        bump_version(model)
+        return True
+    if not target_field.related_model.objects.filter(pk=target_id).exists():
+        return None
+    return False
+
+
+def release_user_rows(model, target_name, counter, user, **filters):
+    """Subtract user's rows of model (matching filters) from each target's counter"""
+    target = model._meta.get_field(target_name).related_model
+    per_target = list(
+        model.objects.filter(user=user, **filters).order_by().values(target_name)
+        .annotate(total=Count('pk')).values_list(target_name, 'total')
+    )
+    for target_id, total in per_target:
+        target.objects.filter(pk=target_id).update(**{counter: F(counter) - total})
+    if per_target:
+        bump_version(target)
+
+
+def track_user_deletes(model, target_name, counter, **filters):
+    """Keep counter in step when deleting a user cascades to their rows of model"""
+    def release(sender, instance, **kwargs):
+        # Sent inside the delete's transaction, before the cascade runs
+        release_user_rows(model, target_name, counter, instance, **filters)
+
+    pre_delete.connect(
+        release, sender=settings.AUTH_USER_MODEL, weak=False,
+        dispatch_uid=f'counter-user-delete-{model._meta.label}-{counter}',
+    )
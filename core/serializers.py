@@ -0,0 +1,127 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only rendering of a `<field>_variants` map (see core/images.py) as
+    {'width', 'height', 'webp': {'320': url, ...}, 'jpeg': {...}}, or None
+    when no variants exist yet. URLs are absolute when a request is in the
+    serializer context, like DRF's ImageField.
+
+    Variants are rebuilt by a background job, so until it runs the map may
+    still describe the previous file; it renders as None while its 'source'
+    differs from the image field (`image_field`, by default the source name
+    without `_variants`).
+    """
+
+    def __init__(self, image_field=None, **kwargs):
+        kwargs['read_only'] = True
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        if self.image_field is None:
+            self.image_field = self.source_attrs[-1].removesuffix('_variants')
+        self.image_source_attrs = [*self.source_attrs[:-1], self.image_field]
+
+    def get_attribute(self, instance):
+        variants = super().get_attribute(instance)
+        image = get_attribute(instance, self.image_source_attrs)
+        return variants, image.name if image else None
+
+    def to_representation(self, value):
+        variants, file_name = value
+        return render_variants(variants, file_name, self.context.get('request'))
+
+
+def render_variants(value, file_name, request=None):
+    """ImageVariantsField's representation of a variants map built for file_name"""
+    if not value or 'width' not in value or value.get('source') != (file_name or None):
+        return None
+    representation = {'width': value['width'], 'height': value['height']}
+    for key, names in value.items():
+        if not isinstance(names, dict):
+            continue
+        urls = {}
+        for width, name in names.items():
+            url = default_storage.url(name)
+            urls[width] = request.build_absolute_uri(url) if request is not None else url
+        representation[key] = urls
+    return representation
+
+
+class ImportedUserField(serializers.Field):
+    """
+    A user named by username in an import row. Usernames are resolved against
+    context['users'], which BulkImportCommand fills once per batch, so rows
+    don't cost a query each.
+    """
+    default_error_messages = {
+        'unknown': 'Unknown user "{username}".',
+    }
+
+    def to_internal_value(self, data):
+        user = self.context['users'].get(str(data))
+        if user is None:
+            self.fail('unknown', username=data)
+        return user
+
+    def to_representation(self, value):
+        return value.username
+
+
+class SparseFieldsetMixin:
+    """
+    Lets GET requests trim the representation with ?fields=a,b (only these)
+    or ?omit=a,b (all but these). Applied when the serializer is built, so
+    dropped fields cost nothing to render; pair with model_columns() to
+    skip reading them from the database as well.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = self.requested_fields(request, 'fields')
+        omitted = self.requested_fields(request, 'omit')
+        unknown = (requested | omitted) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        for name in list(self.fields):
+            if (requested and name not in requested) or name in omitted:
+                self.fields.pop(name)
+
+    @staticmethod
+    def requested_fields(request, param):
+        return {name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()}
+
+
+def model_columns(serializer):
+    """
+    The model field paths serializer reads, for QuerySet.only(). Relations
+    followed by a source (organizer.username) contribute both the foreign key
+    and the target column; method fields and annotations add nothing.
+    """
+    model = serializer.Meta.model
+    columns = {model._meta.pk.name}
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        current, path = model, []
+        for attr in field.source_attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            path.append(attr)
+            if not model_field.is_relation:
+                columns.add('__'.join(path))
+                break
+            columns.add('__'.join(path))
+            current = model_field.related_model
+    return columns
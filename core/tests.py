@@ -0,0 +1,563 @@
+import io
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from awareness.models import BlogPost, Comment, Like
+from protests import views as protest_views
+from protests.models import Protest, Support
+from protests.tests import make_protest
+from users.models import CustomUser
+from . import jobs, viewcounts
+from .fastpath import FastListMixin
+from .images import generate_variants
+from .models import Job
+from .viewcounts import ViewCounter
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+        self.post = BlogPost.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+        cache.clear()
+
+    def assert_views_are_buffered_then_flushed(self, counter):
+        for _ in range(3):
+            counter.record(Protest, self.protest.pk)
+        counter.record(BlogPost, self.post.pk)
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.views_count, 0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(counter.flush(), 4)
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.protest.refresh_from_db()
+        self.post.refresh_from_db()
+        self.assertEqual(self.protest.views_count, 3)
+        self.assertEqual(self.post.views_count, 1)
+        self.assertEqual(counter.flush(), 0)
+
+    def test_memory_buffer(self):
+        self.assert_views_are_buffered_then_flushed(ViewCounter(flush_interval=None))
+
+    def test_cache_buffer(self):
+        self.assert_views_are_buffered_then_flushed(ViewCounter(backend='cache', flush_interval=None))
+
+    def test_cache_buffer_is_shared_between_counters(self):
+        worker = ViewCounter(backend='cache', flush_interval=None)
+        flusher = ViewCounter(backend='cache', flush_interval=None)
+        worker.record(Protest, self.protest.pk)
+        worker.record(Protest, self.protest.pk)
+        self.assertEqual(flusher.flush(), 2)
+        self.assertEqual(worker.flush(), 0)
+
+    def test_max_pending_triggers_flush(self):
+        counter = ViewCounter(flush_interval=None, max_pending=2)
+        counter.record(Protest, self.protest.pk)
+        counter.record(Protest, self.protest.pk)
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.views_count, 2)
+
+    def test_detail_views_record_without_writing(self):
+        counter = ViewCounter(flush_interval=None)
+        client = APIClient()
+        with mock.patch('core.viewcounts._counter', counter):
+            client.get(reverse('protest-detail', args=[self.protest.pk]))
+            client.get(reverse('blogpost-detail', args=[self.post.pk]))
+            self.assertEqual(Protest.objects.get().views_count, 0)
+            counter.flush()
+        self.assertEqual(Protest.objects.get().views_count, 1)
+        self.assertEqual(BlogPost.objects.get().views_count, 1)
+
+    def test_flush_invalidates_cached_lists(self):
+        client = APIClient()
+        url = reverse('blogpost-list')
+        etag = client.get(url)['ETag']
+        self.assertEqual(client.get(url)['X-Cache'], 'HIT')
+
+        counter = ViewCounter(flush_interval=None)
+        counter.record(BlogPost, self.post.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            counter.flush()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['views_count'], 1)
+
+    def test_test_runs_never_flush_after_teardown(self):
+        with mock.patch('core.viewcounts._counter', None), mock.patch('atexit.register') as register:
+            counter = viewcounts.get_view_counter()
+            counter.record(Protest, self.protest.pk)
+        self.assertIsNone(counter._thread)
+        register.assert_not_called()
+
+    def test_flush_command_needs_the_cache_backend(self):
+        with self.assertRaises(CommandError):
+            call_command('flush_view_counts', stdout=io.StringIO())
+
+        ViewCounter(backend='cache', flush_interval=None).record(Protest, self.protest.pk)
+        shared = {'BACKEND': 'cache', 'FLUSH_INTERVAL': None, 'FLUSH_AT_EXIT': False}
+        with override_settings(VIEW_COUNTER=shared), mock.patch('core.viewcounts._counter', None):
+            out = io.StringIO()
+            call_command('flush_view_counts', stdout=out)
+        self.assertIn('Flushed 1 buffered views', out.getvalue())
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.views_count, 1)
+
+
+class VersionedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+        self.post = BlogPost.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+
+    def test_anonymous_list_is_served_from_cache(self):
+        url = reverse('protest-list')
+        self.assertEqual(self.client.get(url, {'city': 'karachi'})['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'city': 'karachi', 'cause': ''})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['results'][0]['id'], self.protest.pk)
+
+    def test_write_invalidates_only_dependent_lists(self):
+        protests_url, posts_url = reverse('protest-list'), reverse('blogpost-list')
+        self.client.get(protests_url)
+        self.client.get(posts_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(blog_post=self.post, user=self.user, content='Hi')
+        self.assertEqual(self.client.get(protests_url)['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(posts_url)['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Support.objects.create(protest=self.protest, user=self.user)
+        self.assertEqual(self.client.get(protests_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(posts_url)['X-Cache'], 'HIT')
+
+    def test_version_is_bumped_once_the_write_commits(self):
+        url = reverse('protest-list')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Support.objects.create(protest=self.protest, user=self.user)
+            # Concurrent readers still see the old rows, so they keep the old version
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('protest-list'))
+        self.assertNotIn('X-Cache', response)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }}):
+            url = reverse('blogpost-list')
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+            with self.captureOnCommitCallbacks(execute=True):
+                Like.objects.create(blog_post=self.post, user=self.user)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+        self.post = BlogPost.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+        counter = mock.patch('core.viewcounts._counter', ViewCounter(flush_interval=None))
+        counter.start()
+        self.addCleanup(counter.stop)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_detail_not_modified_skips_serialization(self):
+        url = reverse('protest-detail', args=[self.protest.pk])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1), mock.patch('protests.views.ProtestSerializer.to_representation') as render:
+            response = self.revalidate(url, f'W/{etag}')
+        render.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_detail_etag_follows_counters_and_viewer(self):
+        url = reverse('blogpost-detail', args=[self.post.pk])
+        etag = self.client.get(url)['ETag']
+        commenter = APIClient()
+        commenter.force_authenticate(self.user)
+        commenter.post(reverse('comment-list', args=[self.post.pk]), {'content': 'Hi'})
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+        etag = self.client.get(url)['ETag']
+
+        Like.objects.create(blog_post=self.post, user=self.user)
+        self.client.force_authenticate(self.user)
+        # Same row, but this viewer's is_liked differs from the anonymous body
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_liked'])
+
+    def test_list_not_modified_without_queries(self):
+        url = reverse('protest-list')
+        etag = self.client.get(url, {'city': 'karachi'})['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'city': 'karachi'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.assertEqual(self.client.get(url, {'city': 'lahore'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            Support.objects.create(protest=self.protest, user=self.user)
+        self.assertEqual(self.client.get(url, {'city': 'karachi'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_is_per_user(self):
+        url = reverse('protest-list')
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.user)
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.revalidate(url, response['ETag']).status_code, 304)
+
+
+class ListQueryPlanTests(TestCase):
+    """Every list endpoint must be answered through an index, never a full scan or sort"""
+    tables = ('protests_protest', 'awareness_blogpost', 'awareness_comment', 'protests_support', 'awareness_like')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        start = timezone.now() + timedelta(days=1)
+        for i in range(3):
+            protest = make_protest(
+                self.user, title=f'Protest {i}', city='karachi', latitude='24.86', longitude='67.00',
+            )
+            Support.objects.create(protest=protest, user=self.user)
+            post = BlogPost.objects.create(title=f'Post {i}', content='Body', author=self.user, is_published=True)
+            Comment.objects.create(blog_post=post, user=self.user, content='Hi')
+        self.post = post
+
+    def plans_for(self, url, params=None):
+        statements = []
+
+        def record(execute, sql, sql_params, many, context):
+            statements.append((sql, sql_params))
+            return execute(sql, sql_params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, url)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for sql, sql_params in statements:
+                if sql.lstrip().upper().startswith('SELECT') and any(table in sql for table in self.tables):
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', sql_params)
+                    plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        self.assertTrue(plans, url)
+        return response, plans
+
+    def assert_indexed(self, url, params=None):
+        response, plans = self.plans_for(url, params)
+        for sql, steps in plans:
+            for step in steps:
+                full_scan = step.startswith('SCAN ') and 'INDEX' not in step and 'VIRTUAL TABLE' not in step
+                self.assertFalse(full_scan, f'{url} {params}: full table scan "{step}"\n{sql}')
+                self.assertNotIn('TEMP B-TREE', step, f'{url} {params}: sort without index "{step}"\n{sql}')
+        return response
+
+    def test_protest_list_access_paths(self):
+        url = reverse('protest-list')
+        for params in ({}, {'city': 'karachi'}, {'cause': 'water'}, {'city': 'karachi', 'cause': 'water'},
+                       {'status': 'approved'}, {'status': 'ongoing'}, {'ordering': '-supporters_count'}):
+            for authenticated in (False, True):
+                self.client.force_authenticate(self.user if authenticated else None)
+                cache.clear()
+                first_page = self.assert_indexed(url, {**params, 'page_size': 1}).json()
+                if first_page['next']:
+                    self.assert_indexed(first_page['next'])
+
+    def test_nearby_uses_geo_cell_index(self):
+        self.assert_indexed(reverse('protest-nearby'), {'lat': 24.86, 'lng': 67.0, 'radius_km': 5})
+
+    def test_blog_post_list_access_paths(self):
+        url = reverse('blogpost-list')
+        for params in ({}, {'ordering': '-likes_count'}):
+            cache.clear()
+            first_page = self.assert_indexed(url, {**params, 'page_size': 1}).json()
+            self.assert_indexed(first_page['next'])
+
+    def test_comment_list_access_path(self):
+        Comment.objects.create(blog_post=self.post, user=self.user, content='Second')
+        url = reverse('comment-list', args=[self.post.pk])
+        first_page = self.assert_indexed(url, {'page_size': 1}).json()
+        self.assert_indexed(first_page['next'])
+
+
+def make_upload(name, size=(2000, 1500), image_format='JPEG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 40, 40)).save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{image_format.lower()}')
+
+
+class FastListTests(TestCase):
+    """The .values() fast path must render exactly the bytes the serializers do"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        variants = {'source': 'posters/a.jpg', 'width': 800, 'height': 600,
+                    'webp': {'320': 'variants/ab/c/320w.webp'}, 'jpeg': {'320': 'variants/ab/c/320w.jpg'}}
+        for i, poster in enumerate(('posters/a.jpg', '')):
+            protest = make_protest(
+                self.user, title=f'Protest {i} \u2014 \u0627\u062d\u062a\u062c\u0627\u062c', description='Details ' * 40,
+                city='karachi', latitude='24.860700' if i else None, longitude='67.001100' if i else None,
+                poster=poster, poster_variants=variants if poster else {},
+            )
+            Support.objects.create(protest=protest, user=self.user)
+            self.post = BlogPost.objects.create(
+                title=f'Post {i}', content='Body', author=self.user, is_published=True, category='laws',
+                featured_image='blog_images/b.png' if i else None, published_at=timezone.now() if i else None,
+            )
+            Comment.objects.create(blog_post=self.post, user=self.user, content='\U0001f44d')
+
+    def assert_same_bytes(self, url, params=None):
+        responses = []
+        for fast in (True, False):
+            cache.clear()
+            with mock.patch.object(FastListMixin, 'fast_list', fast):
+                responses.append(self.client.get(url, params))
+        fast_response, slow_response = responses
+        self.assertEqual(fast_response.status_code, 200, (url, params))
+        self.assertEqual(fast_response.content, slow_response.content, (url, params))
+
+    def test_list_bodies_match_the_serializers(self):
+        protest_params = (
+            {}, {'page_size': 1}, {'ordering': '-supporters_count', 'page_size': 1},
+            {'fields': 'id,latitude,longitude,poster,supporting_documents,organizer,status,start_datetime'},
+            {'omit': 'summary,poster'},
+        )
+        for user in (None, self.user):
+            self.client.force_authenticate(user)
+            for params in protest_params:
+                self.assert_same_bytes(reverse('protest-list'), params)
+            self.assert_same_bytes(reverse('blogpost-list'))
+            self.assert_same_bytes(reverse('blogpost-list'), {'ordering': '-likes_count', 'page_size': 1})
+            self.assert_same_bytes(reverse('comment-list', args=[self.post.pk]))
+
+    def test_list_builds_no_model_instances(self):
+        urls = {reverse('protest-list'): 2, reverse('blogpost-list'): 2, reverse('comment-list', args=[self.post.pk]): 1}
+        for model in (Protest, BlogPost, Comment):
+            patcher = mock.patch.object(model, 'from_db', side_effect=AssertionError(f'{model.__name__} built'))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for url, count in urls.items():
+            self.assertEqual(len(self.client.get(url).json()['results']), count, url)
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = CustomUser.objects.create_user(username='author', password='pass12345')
+        cache.clear()
+
+    def test_upload_generates_variants_exposed_by_the_serializer(self):
+        post = BlogPost.objects.create(
+            title='Post', content='Body', author=self.user, is_published=True,
+            featured_image=make_upload('photo.jpg'),
+        )
+        self.assertEqual(post.featured_image_variants, {})
+        self.assertEqual(jobs.Worker().work(burst=True), 1)
+        post.refresh_from_db()
+        variants = post.featured_image_variants
+        self.assertEqual(variants['source'], post.featured_image.name)
+        self.assertEqual(set(variants['webp']), {'320', '640', '1280'})
+        with Image.open(post.featured_image.storage.open(variants['jpeg']['320'])) as thumbnail:
+            self.assertEqual(thumbnail.size, (320, 240))
+
+        response = APIClient().get(reverse('blogpost-list'))
+        rendered = response.data['results'][0]['featured_image_variants']
+        self.assertEqual((rendered['width'], rendered['height']), (2000, 1500))
+        self.assertTrue(rendered['webp']['640'].startswith('http://testserver/media/variants/'))
+
+    def test_variants_of_a_replaced_image_are_not_served(self):
+        post = BlogPost.objects.create(
+            title='Post', content='Body', author=self.user, is_published=True,
+            featured_image=make_upload('photo.jpg'),
+        )
+        jobs.Worker().work(burst=True)
+        post.refresh_from_db()
+        post.featured_image = make_upload('smaller.jpg', size=(900, 675))
+        post.save()
+
+        # Until the queued job runs, neither the fast list nor the serializer uses the old map
+        client = APIClient()
+        listed = client.get(reverse('blogpost-list')).data['results'][0]
+        detail = client.get(reverse('blogpost-detail', args=[post.pk])).data
+        self.assertIsNone(listed['featured_image_variants'])
+        self.assertIsNone(detail['featured_image_variants'])
+
+        jobs.Worker().work(burst=True)
+        cache.clear()
+        listed = client.get(reverse('blogpost-list')).data['results'][0]
+        self.assertEqual(listed['featured_image_variants']['width'], 900)
+
+    def test_identical_content_reuses_stored_variants(self):
+        first = make_protest(self.user, title='One', poster=make_upload('a.png', size=(500, 400), image_format='PNG'))
+        second = make_protest(self.user, title='Two', poster=make_upload('b.png', size=(500, 400), image_format='PNG'))
+        jobs.Worker().work(burst=True)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        # Never upscaled: a 500px source gets 320 and its own width
+        self.assertEqual(set(first.poster_variants['jpeg']), {'320', '500'})
+        self.assertEqual(first.poster_variants['webp'], second.poster_variants['webp'])
+        self.assertNotEqual(first.poster_variants['source'], second.poster_variants['source'])
+
+    def test_unreadable_image_is_recorded_not_retried(self):
+        post = BlogPost.objects.create(title='Post', content='Body', author=self.user)
+        post.featured_image = SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg')
+        post.save()
+        with self.assertLogs('core.images', 'WARNING'):
+            jobs.Worker().work(burst=True)
+            self.assertIsNone(generate_variants(post.featured_image))
+        post.refresh_from_db()
+        self.assertEqual(post.featured_image_variants, {'source': post.featured_image.name})
+        post.save()
+        self.assertFalse(Job.objects.exists())
+
+
+processed_values = []
+
+
+def record_value(value):
+    processed_values.append(value)
+
+
+def fail_always():
+    raise RuntimeError('boom')
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        processed_values.clear()
+
+    def test_enqueued_job_runs_once_and_is_removed(self):
+        jobs.enqueue(record_value, value=1)
+        jobs.enqueue('core.tests.record_value', value=2, delay=60)
+        self.assertEqual(jobs.Worker().work(burst=True), 1)
+        self.assertEqual(processed_values, [1])
+        self.assertEqual(list(Job.objects.values_list('kwargs', flat=True)), [{'value': 2}])
+
+    def test_claim_is_exclusive(self):
+        job = jobs.enqueue(record_value, value=1)
+        self.assertEqual(jobs.claim_job('worker-a').pk, job.pk)
+        self.assertIsNone(jobs.claim_job('worker-b'))
+
+    def test_rolled_back_write_leaves_no_job(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            jobs.enqueue(record_value, value=1)
+            raise RuntimeError
+        self.assertFalse(Job.objects.exists())
+
+    def test_failures_back_off_then_stop(self):
+        job = jobs.enqueue(fail_always, max_attempts=2)
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.Worker().work(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertIn('RuntimeError: boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('core.jobs', 'ERROR'):
+            jobs.Worker().work(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 2))
+
+    def test_orphaned_jobs_are_released(self):
+        job = jobs.enqueue(record_value, value=1)
+        jobs.claim_job('crashed-worker')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        jobs.Worker().work(burst=True)
+        self.assertEqual(processed_values, [1])
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='viewer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+        Support.objects.create(user=self.user, protest=self.protest)
+        self.post = BlogPost.objects.create(title='Post', content='Body', author=self.user, is_published=True)
+        for i in range(3):
+            Comment.objects.create(blog_post=self.post, user=self.user, content=f'Comment {i}')
+        self.client = APIClient()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def batch(self, urls):
+        return self.client.post(reverse('batch'), {'requests': urls}, format='json')
+
+    def test_combines_responses_in_order_as_the_batch_user(self):
+        detail = reverse('protest-detail', args=[self.protest.pk])
+        comments = reverse('comment-list', args=[self.post.pk]) + '?page_size=2'
+        response = self.batch([detail, comments, reverse('protest-detail', args=[self.protest.pk + 100])])
+        self.assertEqual(response.status_code, 200)
+        first, second, third = response.json()['responses']
+        self.assertEqual((first['status'], first['body']['id']), (200, self.protest.pk))
+        self.assertTrue(first['body']['is_supported'])
+        self.assertEqual(second['status'], 200)
+        self.assertEqual(second['body'], self.client.get(comments).json())
+        self.assertEqual(third['status'], 404)
+
+    def test_sub_requests_ignore_the_batch_validators(self):
+        detail = reverse('protest-detail', args=[self.protest.pk])
+        etag = self.client.get(detail)['ETag']
+        response = self.client.post(
+            reverse('batch'), {'requests': [detail]}, format='json', HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.json()['responses'][0]['status'], 200)
+
+    def test_rejects_invalid_batches(self):
+        stream = reverse('updates:stream', args=[self.protest.pk])
+        for urls in ([], ['/admin/'], ['http://example.com/api/protests/'], [reverse('batch')], [stream], [1],
+                     [reverse('protest-list')] * 11, [reverse('protest-export')], [reverse('like-export')]):
+            with self.subTest(urls=urls):
+                self.assertEqual(self.batch(urls).status_code, 400)
+
+    def test_unmarked_streaming_view_is_refused_per_request(self):
+        self.user.is_staff = True
+        self.user.save()
+        with mock.patch.object(protest_views.export_supports, 'batchable', True):
+            response = self.batch([reverse('support-export'), reverse('protest-detail', args=[self.protest.pk])])
+        streamed, detail = response.json()['responses']
+        self.assertEqual(streamed['status'], 400)
+        self.assertEqual(detail['status'], 200)
@@ -0,0 +1,247 @@
+"""
+Write-behind views_count counter.
+
+Detail views call record_view() instead of issuing an UPDATE per request.
+Increments are summed in a buffer and written back as one batched UPDATE per
+model every FLUSH_INTERVAL seconds (or sooner once MAX_PENDING views pile up),
+so a viral page costs one write per interval instead of one per hit. A crash
+loses at most the views buffered since the last flush.
+
+`manage.py flush_view_counts` drains the buffer from outside the web workers,
+so it only works with the 'cache' backend: a 'memory' buffer lives in the
+worker that counted the views and is flushed by that worker alone.
+
+Configured through settings.VIEW_COUNTER:
+
+    'BACKEND'         'memory' keeps the buffer in this process, 'cache' keeps it
+                      in CACHES['default'] so it is shared between workers and
+                      survives a worker restart (needs a cross-process cache)
+    'FLUSH_INTERVAL'  seconds between background flushes, None to only flush
+                      on MAX_PENDING, at exit or (with 'cache') via
+                      `manage.py flush_view_counts`
+    'MAX_PENDING'     buffered views that trigger an immediate flush
+    'FLUSH_AT_EXIT'   flush what is left when the process exits; off under
+                      `manage.py test`, whose database is gone by then
+"""
+import atexit
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .cache import bump_version
+
+DEFAULTS = {
+    'BACKEND': 'memory',
+    'FLUSH_INTERVAL': 10,
+    'MAX_PENDING': 1000,
+    'FLUSH_AT_EXIT': True,
+}
+
+# Keeps each UPDATE ... CASE statement well under SQLite's expression depth limit
+UPDATE_BATCH_SIZE = 500
+
+
+def options():
+    return {**DEFAULTS, **getattr(settings, 'VIEW_COUNTER', {})}
+
+
+def apply_increments(pending):
+    """Write {model_label: {pk: amount}} back with one UPDATE per model per batch"""
+    with transaction.atomic():
+        for label, counts in pending.items():
+            model = apps.get_model(label)
+            # update() sends no post_save, and views_count is in cached bodies and ETags
+            transaction.on_commit(partial(bump_version, model))
+            items = [(pk, amount) for pk, amount in counts.items() if amount]
+            for start in range(0, len(items), UPDATE_BATCH_SIZE):
+                batch = items[start:start + UPDATE_BATCH_SIZE]
+                increment = Case(
+                    *[When(pk=pk, then=Value(amount)) for pk, amount in batch],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                model.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                    views_count=F('views_count') + increment
+                )
+
+
+class MemoryViewBuffer:
+    """Per-process buffer; cheapest option, lost if the worker dies"""
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = defaultdict(Counter)
+        self._size = 0
+
+    def add(self, label, pk, amount):
+        with self._lock:
+            self._pending[label][pk] += amount
+            self._size += amount
+            return self._size >= self.max_pending
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            self._size = 0
+        return pending
+
+    def restore(self, pending):
+        """Put back increments whose flush failed so they are retried next time"""
+        with self._lock:
+            for label, counts in pending.items():
+                self._pending[label].update(counts)
+                self._size += sum(counts.values())
+
+
+class CacheViewBuffer:
+    """
+    Buffer held in the shared cache, so every worker and `flush_view_counts`
+    see the same pending counts. Each object has a counter key plus a dirty flag;
+    only the first view after a flush takes the registry lock to list the object,
+    and a flush subtracts exactly what it read so racing increments are kept.
+    """
+    key_prefix = 'viewcount'
+    lock_timeout = 5
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self._size = 0
+
+    def key(self, kind, label=None, pk=None):
+        return ':'.join(str(part) for part in (self.key_prefix, kind, label, pk) if part is not None)
+
+    def add(self, label, pk, amount):
+        count_key = self.key('count', label, pk)
+        cache.add(count_key, 0, timeout=None)
+        cache.incr(count_key, amount)
+        if cache.add(self.key('dirty', label, pk), 1, timeout=None):
+            with self._registry() as registry:
+                registry.add((label, pk))
+        # Approximate per-process size; the background flusher covers the rest
+        self._size += amount
+        return self._size >= self.max_pending
+
+    def drain(self):
+        self._size = 0
+        with self._registry() as registry:
+            dirty = set(registry)
+            registry.clear()
+        pending = defaultdict(Counter)
+        for label, pk in dirty:
+            # Clear the flag first: a view landing after this re-registers itself
+            cache.delete(self.key('dirty', label, pk))
+            count_key = self.key('count', label, pk)
+            amount = cache.get(count_key)
+            if amount:
+                cache.decr(count_key, amount)
+                pending[label][pk] += amount
+        return pending
+
+    def restore(self, pending):
+        for label, counts in pending.items():
+            for pk, amount in counts.items():
+                self.add(label, pk, amount)
+
+    @contextmanager
+    def _registry(self):
+        lock_key = self.key('lock')
+        while not cache.add(lock_key, 1, timeout=self.lock_timeout):
+            time.sleep(0.005)
+        try:
+            registry = cache.get(self.key('registry')) or set()
+            yield registry
+            cache.set(self.key('registry'), registry, timeout=None)
+        finally:
+            cache.delete(lock_key)
+
+
+class ViewCounter:
+    def __init__(self, backend='memory', flush_interval=10, max_pending=1000):
+        buffer_class = CacheViewBuffer if backend == 'cache' else MemoryViewBuffer
+        self.buffer = buffer_class(max_pending)
+        self.flush_interval = flush_interval
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+
+    def record(self, model, pk, amount=1):
+        if self.buffer.add(model._meta.label, pk, amount):
+            self.flush()
+        elif self.flush_interval and self._thread is None:
+            self._start_flusher()
+
+    def flush(self):
+        """Write buffered increments to the database; returns the number of views written"""
+        with self._flush_lock:
+            pending = self.buffer.drain()
+            if not pending:
+                return 0
+            try:
+                apply_increments(pending)
+            except Exception:
+                self.buffer.restore(pending)
+                raise
+            return sum(sum(counts.values()) for counts in pending.values())
+
+    def _start_flusher(self):
+        with self._thread_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run_flusher, name='view-counter-flush', daemon=True)
+            self._thread.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # Increments were restored; try again on the next tick
+                pass
+            finally:
+                close_old_connections()
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_view_counter():
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                config = options()
+                _counter = ViewCounter(
+                    backend=config['BACKEND'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    max_pending=config['MAX_PENDING'],
+                )
+                if config['FLUSH_AT_EXIT']:
+                    atexit.register(_flush_at_exit)
+    return _counter
+
+
+def _flush_at_exit():
+    try:
+        _counter.flush()
+    except Exception:
+        pass
+
+
+def record_view(instance):
+    """Count one view of a model instance that has a views_count field"""
+    get_view_counter().record(type(instance), instance.pk)
+
+
+def flush_views():
+    return get_view_counter().flush()
@@ -0,0 +1,24 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .batch import BatchError, run_batch
+
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def batch(request):
+    """
+    Run several API GETs in one call: {"requests": ["/api/protests/5/", ...]}
+    -> {"responses": [{"status": 200, "body": {...}}, ...]}, in request order.
+    Each sub-request sees the same user as the batch.
+    """
+    urls = request.data.get('requests') if isinstance(request.data, dict) else None
+    try:
+        responses = run_batch(request, urls)
+    except BatchError as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'responses': responses})
+
+
+batch.batchable = False
@@ -0,0 +1,33 @@
+import React from 'react';
+
+const toSrcSet = (urls = {}) =>
+  Object.entries(urls)
+    .map(([width, url]) => `${url} ${width}w`)
+    .join(', ');
+
+// Renders the server-generated WebP/JPEG variants of an image (see the
+// *_variants fields in the API), falling back to the original upload
+const ResponsiveImage = ({ variants, src, sizes = '100vw', alt = '', className = '' }) => {
+  if (!variants) {
+    return src ? <img src={src} alt={alt} className={className} loading="lazy" /> : null;
+  }
+  const jpegWidths = Object.keys(variants.jpeg || {}).map(Number).sort((a, b) => a - b);
+  const fallback = variants.jpeg?.[jpegWidths[0]] || src;
+  return (
+    <picture>
+      <source type="image/webp" srcSet={toSrcSet(variants.webp)} sizes={sizes} />
+      <img
+        src={fallback}
+        srcSet={toSrcSet(variants.jpeg)}
+        sizes={sizes}
+        width={variants.width}
+        height={variants.height}
+        alt={alt}
+        className={className}
+        loading="lazy"
+      />
+    </picture>
+  );
+};
+
+export default ResponsiveImage;
@@ -1,20 +1,41 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { awarenessAPI } from '../services/api';
+import { awarenessAPI, batchGet } from '../services/api';
 
 const BlogDetail = ({ user }) => {
   const { id } = useParams();
   const [post, setPost] = useState(null);
   const [loading, setLoading] = useState(true);
   const [comments, setComments] = useState([]);
+  const [nextCommentsPage, setNextCommentsPage] = useState(null);
   const [newComment, setNewComment] = useState('');
   const [commentLoading, setCommentLoading] = useState(false);
 
   useEffect(() => {
-    fetchBlogPost();
-    fetchComments();
+    fetchPostWithComments();
   }, [id]);
 
+  // The post and its first page of comments in one request
+  const fetchPostWithComments = async () => {
+    try {
+      const [postResponse, commentsResponse] = await batchGet([
+        `/awareness/posts/${id}/`,
+        `/awareness/posts/${id}/comments/`,
+      ]);
+      if (postResponse.status === 200) {
+        setPost(postResponse.data);
+      }
+      if (commentsResponse.status === 200) {
+        setComments(commentsResponse.data.results);
+        setNextCommentsPage(commentsResponse.data.next);
+      }
+    } catch (error) {
+      console.error('Error fetching blog post:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const fetchBlogPost = async () => {
     try {
       const response = await awarenessAPI.getBlogPost(id);
@@ -26,10 +47,12 @@ const BlogDetail = ({ user }) => {
     }
   };
 
-  const fetchComments = async () => {
+  const fetchComments = async (pageUrl = null) => {
     try {
-      const response = await awarenessAPI.getComments(id);
-      setComments(response.data);
+      const response = await awarenessAPI.getComments(id, pageUrl);
+      const { results, next } = response.data;
+      setComments(pageUrl ? (current) => [...current, ...results] : results);
+      setNextCommentsPage(next);
     } catch (error) {
       console.error('Error fetching comments:', error);
     }
@@ -42,7 +65,7 @@ const BlogDetail = ({ user }) => {
     }
 
     try {
-      await awarenessAPI.likeBlogPost(id);
+      await awarenessAPI.setLike(id, !post.is_liked);
       fetchBlogPost(); // Refresh post data
     } catch (error) {
       console.error('Error liking post:', error);
@@ -62,7 +85,7 @@ const BlogDetail = ({ user }) => {
     try {
       await awarenessAPI.createComment(id, { content: newComment });
       setNewComment('');
-      fetchComments(); // Refresh comments
+      fetchPostWithComments(); // Refresh comments and comment count
     } catch (error) {
       console.error('Error submitting comment:', error);
     } finally {
@@ -145,7 +168,7 @@ const BlogDetail = ({ user }) => {
           {/* Comments Section */}
           <section className="border-t pt-8">
             <h3 className="text-xl font-semibold text-gray-900 mb-6">
-              💬 Comments ({comments.length})
+              💬 Comments ({post.comment_count})
             </h3>
 
             {/* Add Comment Form */}
@@ -191,6 +214,16 @@ const BlogDetail = ({ user }) => {
                 ))
               )}
             </div>
+            {nextCommentsPage && (
+              <div className="mt-4 flex justify-center">
+                <button
+                  onClick={() => fetchComments(nextCommentsPage)}
+                  className="text-green-600 hover:text-green-700 font-medium"
+                >
+                  Load more comments
+                </button>
+              </div>
+            )}
           </section>
 
           {/* Back Button */}
@@ -1,20 +1,24 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { awarenessAPI } from '../services/api';
+import ResponsiveImage from '../components/ResponsiveImage';
 
 const BlogList = ({ user }) => {
   const [blogPosts, setBlogPosts] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextPage, setNextPage] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('');
 
   useEffect(() => {
     fetchBlogPosts();
   }, []);
 
-  const fetchBlogPosts = async () => {
+  const fetchBlogPosts = async (pageUrl = null) => {
     try {
-      const response = await awarenessAPI.getBlogPosts();
-      setBlogPosts(response.data);
+      const response = await awarenessAPI.getBlogPosts(pageUrl);
+      const { results, next } = response.data;
+      setBlogPosts(pageUrl ? (current) => [...current, ...results] : results);
+      setNextPage(next);
     } catch (error) {
       console.error('Error fetching blog posts:', error);
     } finally {
@@ -22,14 +26,14 @@ const BlogList = ({ user }) => {
     }
   };
 
-  const likeBlogPost = async (postId) => {
+  const likeBlogPost = async (postId, liked) => {
     if (!user) {
       alert('Please login to like posts');
       return;
     }
 
     try {
-      await awarenessAPI.likeBlogPost(postId);
+      await awarenessAPI.setLike(postId, liked);
       fetchBlogPosts(); // Refresh to update like counts
     } catch (error) {
       console.error('Error liking post:', error);
@@ -131,6 +135,15 @@ const BlogList = ({ user }) => {
               <div className="space-y-6">
                 {filteredPosts.map(post => (
                   <div key={post.id} className="card p-6 hover:shadow-lg transition-shadow">
+                    {post.featured_image && (
+                      <ResponsiveImage
+                        variants={post.featured_image_variants}
+                        src={post.featured_image}
+                        sizes="(min-width: 1024px) 720px, 100vw"
+                        alt={post.title}
+                        className="w-full h-56 object-cover rounded mb-4"
+                      />
+                    )}
                     <div className="flex justify-between items-start mb-4">
                       <div>
                         <h2 className="text-xl font-semibold text-gray-900 mb-2">
@@ -145,7 +158,7 @@ const BlogList = ({ user }) => {
                         </div>
                       </div>
                       <button
-                        onClick={() => likeBlogPost(post.id)}
+                        onClick={() => likeBlogPost(post.id, !post.is_liked)}
                         className={`flex items-center space-x-1 px-3 py-1 rounded-full text-sm ${
                           post.is_liked
                             ? 'bg-red-100 text-red-600'
@@ -179,6 +192,16 @@ const BlogList = ({ user }) => {
                 ))}
               </div>
             )}
+            {nextPage && (
+              <div className="mt-6 flex justify-center">
+                <button
+                  onClick={() => fetchBlogPosts(nextPage)}
+                  className="btn border border-green-600 text-green-600 hover:bg-green-600 hover:text-white"
+                >
+                  Load more
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </div>
@@ -1,5 +1,6 @@
 import React from 'react';
 import { Link } from 'react-router-dom';
+import ResponsiveImage from '../components/ResponsiveImage';
 
 const ProfileView = ({ user }) => {
   const cities = [
@@ -36,7 +37,13 @@ const ProfileView = ({ user }) => {
           {/* Banner */}
           <div className="relative h-40 bg-gray-200">
             {user?.banner_image && (
-              <img src={user.banner_image} alt="Banner" className="w-full h-40 object-cover" />
+              <ResponsiveImage
+                variants={user.banner_image_variants}
+                src={user.banner_image}
+                sizes="(min-width: 896px) 896px, 100vw"
+                alt="Banner"
+                className="w-full h-40 object-cover"
+              />
             )}
           </div>
 
@@ -45,7 +52,13 @@ const ProfileView = ({ user }) => {
               <div className="flex items-center gap-4 -mt-16">
                 <div className="w-24 h-24 rounded-full overflow-hidden border-4 border-white bg-gray-200">
                   {user?.profile_image && (
-                    <img src={user.profile_image} alt="Profile" className="w-full h-full object-cover" />
+                    <ResponsiveImage
+                      variants={user.profile_image_variants}
+                      src={user.profile_image}
+                      sizes="96px"
+                      alt="Profile"
+                      className="w-full h-full object-cover"
+                    />
                   )}
                 </div>
                 <div>
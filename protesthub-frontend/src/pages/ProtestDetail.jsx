@@ -31,7 +31,7 @@ const ProtestDetail = ({ user }) => {
 
     setSupporting(true);
     try {
-      await protestAPI.supportProtest(id);
+      await protestAPI.setSupport(id, !protest.is_supported);
       fetchProtest(); // Refresh protest data
     } catch (error) {
       console.error('Error supporting protest:', error);
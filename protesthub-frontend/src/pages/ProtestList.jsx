@@ -1,19 +1,23 @@
 import React, { useState, useEffect } from 'react';
 import { Link, useLocation } from 'react-router-dom';
 import { protestAPI } from '../services/api';
+import ResponsiveImage from '../components/ResponsiveImage';
 
 const ProtestList = ({ user }) => {
   const [protests, setProtests] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextPage, setNextPage] = useState(null);
   const [filters, setFilters] = useState({
     city: '',
     cause: ''
   });
   const location = useLocation();
-  const fetchProtests = async () => {
+  const fetchProtests = async (pageUrl = null) => {
     try {
-      const response = await protestAPI.getProtests(filters);
-      setProtests(response.data);
+      const response = await protestAPI.getProtests(filters, pageUrl);
+      const { results, next } = response.data;
+      setProtests(pageUrl ? (current) => [...current, ...results] : results);
+      setNextPage(next);
     } catch (error) {
       console.error('Error fetching protests:', error);
     } finally {
@@ -26,14 +30,14 @@ useEffect(() => {
   fetchProtests();
 }, [filters]); // Remove fetchProtests from dependencies
 
-  const supportProtest = async (protestId) => {
+  const supportProtest = async (protestId, supported) => {
     if (!user) {
       alert('Please login to support protests');
       return;
     }
 
     try {
-      await protestAPI.supportProtest(protestId);
+      await protestAPI.setSupport(protestId, supported);
       fetchProtests(); // Refresh list
     } catch (error) {
       console.error('Error supporting protest:', error);
@@ -161,9 +165,18 @@ useEffect(() => {
               <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
                 {protests.map(protest => (
                   <div key={protest.id} className="card p-6 hover:shadow-lg transition-shadow">
+                    {protest.poster && (
+                      <ResponsiveImage
+                        variants={protest.poster_variants}
+                        src={protest.poster}
+                        sizes="(min-width: 768px) 360px, 100vw"
+                        alt={protest.title}
+                        className="w-full h-48 object-cover rounded mb-4"
+                      />
+                    )}
                     <h3 className="text-xl font-semibold text-gray-900 mb-3">{protest.title}</h3>
                     <p className="text-gray-600 mb-4 line-clamp-3">
-                      {protest.description}
+                      {protest.summary}
                     </p>
                     
                     <div className="space-y-2 mb-4">
@@ -193,7 +206,7 @@ useEffect(() => {
                         View Details
                       </Link>
                       <button
-                        onClick={() => supportProtest(protest.id)}
+                        onClick={() => supportProtest(protest.id, !protest.is_supported)}
                         className={`btn flex-1 text-center ${
                           protest.is_supported 
                             ? 'bg-green-600 text-white hover:bg-green-700' 
@@ -207,6 +220,16 @@ useEffect(() => {
                 ))}
               </div>
             )}
+            {nextPage && (
+              <div className="mt-6 flex justify-center">
+                <button
+                  onClick={() => fetchProtests(nextPage)}
+                  className="btn border border-green-600 text-green-600 hover:bg-green-600 hover:text-white"
+                >
+                  Load more
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </div>
@@ -41,6 +41,15 @@ api.interceptors.response.use(
   }
 );
 
+// Several GETs in one round trip through POST /batch/. Paths are relative to
+// the API base ('/protests/5/'); resolves to [{ status, data }] in the same order.
+const API_PATH = new URL(API_BASE_URL).pathname;
+
+export const batchGet = async (paths) => {
+  const response = await api.post('/batch/', { requests: paths.map((path) => `${API_PATH}${path}`) });
+  return response.data.responses.map(({ status, body }) => ({ status, data: body }));
+};
+
 export const authAPI = {
   login: (credentials) => api.post('/auth/login/', credentials),
   register: (userData) => api.post('/auth/register/', userData),
@@ -49,19 +58,31 @@ export const authAPI = {
   updateProfile: (profileData) => api.put('/auth/profile/', profileData),
 };
 
+// List endpoints are cursor-paginated and return { next, results }.
+// Pass the previous page's `next` URL to fetch the following page.
+const getPage = (path, params = {}, nextUrl = null) =>
+  nextUrl ? api.get(nextUrl) : api.get(path, { params });
+
 export const protestAPI = {
-  getProtests: (filters = {}) => api.get('/protests/', { params: filters }),
+  getProtests: (filters = {}, nextUrl = null) => getPage('/protests/', filters, nextUrl),
   getProtest: (id) => api.get(`/protests/${id}/`),
+  // Most supported recently, with trending_score = decayed supporters
+  getTrending: (city = '') => api.get('/protests/trending/', { params: city ? { city } : {} }),
   createProtest: (protestData) => api.post('/protests/', protestData),
-  supportProtest: (protestId) => api.post(`/protests/${protestId}/support/`),
+  // PUT/DELETE are idempotent: repeating a request leaves the same state
+  setSupport: (protestId, supported) =>
+    supported ? api.put(`/protests/${protestId}/support/`) : api.delete(`/protests/${protestId}/support/`),
+  // response.data.supported is { [id]: true/false } for the logged-in user, in one request
+  getSupportState: (protestIds) => api.post('/protests/support-state/', { ids: protestIds }),
 };
 // Add to your existing api.js file
 export const awarenessAPI = {
-  getBlogPosts: () => api.get('/awareness/posts/'),
+  getBlogPosts: (nextUrl = null) => getPage('/awareness/posts/', {}, nextUrl),
   getBlogPost: (id) => api.get(`/awareness/posts/${id}/`),
   createBlogPost: (postData) => api.post('/awareness/posts/', postData),
-  likeBlogPost: (postId) => api.post(`/awareness/posts/${postId}/like/`),
-  getComments: (postId) => api.get(`/awareness/posts/${postId}/comments/`),
+  setLike: (postId, liked) =>
+    liked ? api.put(`/awareness/posts/${postId}/like/`) : api.delete(`/awareness/posts/${postId}/like/`),
+  getComments: (postId, nextUrl = null) => getPage(`/awareness/posts/${postId}/comments/`, {}, nextUrl),
   createComment: (postId, commentData) => api.post(`/awareness/posts/${postId}/comments/`, commentData),
 };
 
@@ -3,6 +3,23 @@ ASGI config for protesthub project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Live protest updates (/api/protests/<id>/updates/stream/) are async views that
+hold one coroutine per subscriber on the event loop, so serve the project with
+an ASGI server to keep thousands of idle streams on a single worker, e.g.:
+
+    pip install uvicorn
+    uvicorn protesthub.asgi:application --workers 4
+
+(daphne or hypercorn work too). Updates are pushed at once to streams on the
+worker that saved them; streams on other workers get them at their next
+heartbeat, when they re-read the database (updates/views.py).
+
+The streams can't be served under WSGI,
+including `manage.py runserver`: a WSGI server reads a streaming response's
+async iterator to the end before it sends anything, so an endless stream would
+never send a byte. The stream view therefore answers WSGI requests with 501,
+and clients fall back to polling /api/protests/<id>/updates/?after_id=.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -4,6 +4,7 @@ Generated by 'django-admin startproject' using Django 5.0.6.
 """
 
 import os
+import sys
 from pathlib import Path
 # Add to the top of settings.py
 from corsheaders.defaults import default_headers
@@ -45,6 +46,8 @@ INSTALLED_APPS = [
     'protests',     # Protest management
     'awareness',    # Blog and awareness posts
     'updates',      # Live protest updates
+    'search',       # Full-text search (SQLite FTS5)
+    'core',         # Shared API infrastructure (pagination, caching, view counters)
 
     'django_filters',
     'cloudinary',
@@ -169,9 +172,10 @@ SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 
 # REST Framework settings to handle CSRF
 REST_FRAMEWORK = {
+    # Token first so API clients never pay for a session lookup; see users/authentication.py
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -184,8 +188,70 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
+    # Keyset pagination on (created_at, id) - see core/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
 }
 
+# Cache used for anonymous list responses and their per-model version keys
+# (core/cache.py). LocMemCache is per process; use FileBasedCache
+# ('django.core.cache.backends.filebased.FileBasedCache' with a directory
+# LOCATION) or a shared server cache to share entries between workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'protesthub',
+    }
+}
+RESPONSE_CACHE_TIMEOUT = 300  # seconds
+
+# In-process token -> user cache for CachedTokenAuthentication - see
+# users/authentication.py. It is OFF with the LocMemCache above: revocations
+# must reach every worker through CACHES['default'], so with a process-local
+# cache each authenticated request still looks its token up in the database.
+# Switch CACHES['default'] to a shared backend (Redis, Memcached, database,
+# file) to turn it on; see README.md
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': 10000,  # tokens kept per worker (LRU)
+    'TTL': 300,         # seconds before a cached token is re-checked in the DB
+}
+
+# Login/registration password hashing pool - see users/hashing.py
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': 4,   # concurrent PBKDF2 computations
+    'MAX_QUEUE': 16,    # requests allowed to wait; beyond this they get 503
+}
+
+# Write-behind views_count buffering - see core/viewcounts.py
+# Under `manage.py test` nothing flushes in the background or at exit: by then
+# the test database is gone and the views would land in db.sqlite3
+TESTING = sys.argv[1:2] == ['test']
+VIEW_COUNTER = {
+    'BACKEND': 'memory',      # 'memory' (per process) or 'cache' (CACHES['default'])
+    'FLUSH_INTERVAL': None if TESTING else 10,  # seconds between batched UPDATEs
+    'MAX_PENDING': 1000,      # flush early once this many views are buffered
+    'FLUSH_AT_EXIT': not TESTING,
+}
+
+# Several API GETs in one call, POST /api/batch/ - see core/batch.py
+BATCH_REQUESTS = {
+    'MAX_REQUESTS': 10,  # sub-requests per batch
+    'MAX_WORKERS': 4,    # parallel sub-requests (not on SQLite, which runs them in turn)
+}
+
+# Time-decayed trending scores - see protests/trending.py
+TRENDING = {
+    'HALF_LIFE_HOURS': 24,  # a support counts half as much after this long; rerun rebalance_trending after changing
+}
+
+# Background jobs, run by `manage.py runworker` - see core/jobs.py
+JOB_QUEUE = {
+    'POLL_INTERVAL': 1.0,   # seconds an idle worker waits before polling again
+    'MAX_ATTEMPTS': 5,      # tries before a job is left as failed
+    'BACKOFF_BASE': 10,     # seconds before the first retry, doubling each time
+    'BACKOFF_MAX': 3600,
+    'LOCK_TIMEOUT': 600,    # seconds before a running job is presumed orphaned
+}
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
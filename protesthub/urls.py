@@ -8,8 +8,11 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls')),
     path('api/protests/', include('protests.urls')),
+    path('api/protests/', include('updates.urls')),
     # path('api/awareness/', include('awareness.urls')),
        path('api/awareness/', include('awareness.urls')),  # Add this line
+    path('api/search/', include('search.urls')),
+    path('api/batch/', include('core.urls')),
     # Allauth URLs (keep them separate)
     path('accounts/', include('allauth.urls')),
 ]
@@ -1,6 +1,29 @@
 from django.contrib import admin
 from .models import Protest, Support
+from .trending import set_support
 
-# Simple admin registration
-admin.site.register(Protest)
-admin.site.register(Support)
\ No newline at end of file
+
+@admin.register(Protest)
+class ProtestAdmin(admin.ModelAdmin):
+    # Counters move by F() updates; a form save would write back a stale value
+    readonly_fields = ('supporters_count', 'views_count')
+
+
+@admin.register(Support)
+class SupportAdmin(admin.ModelAdmin):
+    """Supports are made through the API; deleting one here withdraws it like the API does"""
+    list_display = ('__str__', 'created_at')
+    list_select_related = ('user', 'protest')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        set_support(obj.user, obj.protest_id, False)
+
+    def delete_queryset(self, request, queryset):
+        for support in queryset.select_related('user'):
+            self.delete_model(request, support)
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class ProtestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'protests'
+
+    def ready(self):
+        from core.cache import track_versions
+        from core.images import track_image_variants
+        from core.reactions import track_user_deletes
+        from .models import Protest, Support
+        track_versions(Protest, Support)
+        track_user_deletes(Support, 'protest', 'supporters_count')
+        track_image_variants(Protest, 'poster')
@@ -0,0 +1,55 @@
+"""
+Grid-cell spatial key for "protests near me" without PostGIS.
+
+The globe is cut into CELL_SIZE_DEG x CELL_SIZE_DEG cells numbered row-major,
+so every latitude row of a bounding box is one contiguous range of cell ids.
+A radius query becomes a handful of index range scans on Protest.geo_cell,
+then an exact haversine check on the few candidates that survive.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_SIZE_DEG = 0.1  # ~11 km north-south
+GRID_COLUMNS = int(360 / CELL_SIZE_DEG)
+MAX_RADIUS_KM = 100
+
+
+def grid_cell(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    row = min(int((float(latitude) + 90) / CELL_SIZE_DEG), int(180 / CELL_SIZE_DEG) - 1)
+    column = min(int((float(longitude) + 180) / CELL_SIZE_DEG), GRID_COLUMNS - 1)
+    return row * GRID_COLUMNS + column
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle, clamped to valid coordinates"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # Longitude degrees shrink with cos(latitude); use the widest edge of the box
+    widest = min(abs(latitude) + lat_delta, 89.9)
+    lng_delta = lat_delta / math.cos(math.radians(widest))
+    return (
+        max(latitude - lat_delta, -90.0),
+        min(latitude + lat_delta, 90.0),
+        max(longitude - lng_delta, -180.0),
+        min(longitude + lng_delta, 180.0),
+    )
+
+
+def cell_ranges(box):
+    """Inclusive (first, last) geo_cell ranges covering box, one per grid row"""
+    min_lat, max_lat, min_lng, max_lng = box
+    first_row = grid_cell(min_lat, min_lng) // GRID_COLUMNS
+    last_row = grid_cell(max_lat, min_lng) // GRID_COLUMNS
+    first_column = grid_cell(min_lat, min_lng) % GRID_COLUMNS
+    last_column = grid_cell(min_lat, max_lng) % GRID_COLUMNS
+    return [
+        (row * GRID_COLUMNS + first_column, row * GRID_COLUMNS + last_column)
+        for row in range(first_row, last_row + 1)
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
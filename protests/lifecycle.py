@@ -0,0 +1,57 @@
+"""
+Status lifecycle of public protests.
+
+Once approved, a protest's status follows its schedule:
+
+    approved -> upcoming   before start_datetime
+    approved/upcoming -> ongoing   from start_datetime until end_datetime
+    approved/upcoming/ongoing -> completed   from end_datetime
+
+advance_statuses() finds the due rows of each transition with a range read on
+the partial start_datetime / end_datetime indexes and moves them
+with one UPDATE per transition, so `?status=ongoing` is a plain indexed
+filter instead of a per-row check against the clock. Rejected, pending and
+cancelled protests are never touched.
+
+Run by `manage.py advance_protest_status`, once from cron or with --watch.
+"""
+from django.db import transaction
+from django.db.models import Min
+
+from core.cache import bump_version
+from .models import SCHEDULED_STATUSES, Protest, status_in
+
+# (target status, statuses it is reached from, due condition at `now`), in
+# order: rows past their end are completed before `ongoing` looks at start times
+TRANSITIONS = (
+    ('completed', SCHEDULED_STATUSES, lambda now: {'end_datetime__lte': now}),
+    ('ongoing', ('approved', 'upcoming'), lambda now: {'start_datetime__lte': now}),
+    ('upcoming', ('approved',), lambda now: {'start_datetime__gt': now}),
+)
+
+
+def advance_statuses(now):
+    """Apply every transition due at `now`; returns {status: rows moved}"""
+    moved = {}
+    with transaction.atomic():
+        for target, sources, due in TRANSITIONS:
+            # updated_at changes too: it feeds the detail ETag and incremental exports
+            moved[target] = Protest.objects.filter(status_in(sources), **due(now)).update(
+                status=target, updated_at=now,
+            )
+    if any(moved.values()):
+        # update() sends no post_save, so the list caches are invalidated here
+        bump_version(Protest)
+    return moved
+
+
+def next_transition(now):
+    """When the earliest scheduled transition after `now` falls due, or None"""
+    upcoming = Protest.objects.filter(status_in(('approved', 'upcoming')), start_datetime__gt=now)
+    ongoing = Protest.objects.filter(status_in(('ongoing',)), end_datetime__gt=now)
+    times = [
+        upcoming.aggregate(at=Min('start_datetime'))['at'],
+        ongoing.aggregate(at=Min('end_datetime'))['at'],
+    ]
+    times = [at for at in times if at is not None]
+    return min(times) if times else None
@@ -0,0 +1,42 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from protests.lifecycle import advance_statuses, next_transition
+
+
+class Command(BaseCommand):
+    help = 'Move approved protests through upcoming, ongoing and completed (see protests/lifecycle.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep running, waking when the next transition is due')
+        parser.add_argument('--interval', type=float, default=60, help='Longest sleep between passes in --watch mode')
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        if options['watch']:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        while True:
+            now = timezone.now()
+            moved = advance_statuses(now)
+            if any(moved.values()) or options['verbosity'] > 1:
+                self.stdout.write(', '.join(f'{count} -> {status}' for status, count in moved.items()))
+            if not options['watch']:
+                return
+            # Newly approved protests have no scheduled time, so poll at least every interval
+            due = next_transition(now)
+            wait = options['interval'] if due is None else (due - timezone.now()).total_seconds()
+            close_old_connections()
+            deadline = time.monotonic() + min(max(wait, 0), options['interval'])
+            while not self.stopping and time.monotonic() < deadline:
+                time.sleep(min(1, deadline - time.monotonic()))
+            if self.stopping:
+                return
+
+    def stop(self, *args):
+        self.stopping = True
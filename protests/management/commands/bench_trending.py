@@ -0,0 +1,122 @@
+import math
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from protests.models import PAKISTAN_CITIES, SCHEDULED_STATUSES, Protest, Support, TrendingScore, status_in
+from protests.trending import rebalance, set_support, top_protests
+from users.models import CustomUser
+
+# Distinct support timestamps generated, spread over the last week
+TIMESTAMPS = 10007
+
+
+class Command(BaseCommand):
+    help = 'Compare trending reads against counting supports per request (data rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--supports', type=int, default=10_000_000, help='Support rows to generate')
+        parser.add_argument('--protests', type=int, default=100_000, help='Protests they are spread over')
+        parser.add_argument('--top', type=int, default=20, help='K of the top-K reads')
+        parser.add_argument('--updates', type=int, default=1000, help='Supports added through set_support()')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per read measurement')
+
+    def handle(self, *args, **options):
+        supports, protests, top = options['supports'], options['protests'], options['top']
+        now = timezone.now()
+        city = PAKISTAN_CITIES[0][0]
+
+        with transaction.atomic():
+            self.stdout.write(f'Generating {supports:,} supports over {protests:,} protests...')
+            started = time.perf_counter()
+            protest_ids = self.generate(supports, protests, now)
+            self.stdout.write(f'  generated in {time.perf_counter() - started:.0f}s')
+
+            started = time.perf_counter()
+            rows = rebalance(now)
+            self.stdout.write(f'rebalance: {rows:,} scores in {time.perf_counter() - started:.1f}s')
+
+            counted = Support.objects.filter(status_in(SCHEDULED_STATUSES, 'protest__status'))
+            cases = (
+                ('count supports', lambda: list(
+                    counted.values('protest').annotate(total=Count('pk')).order_by('-total')[:top]
+                )),
+                ('count supports ?city=', lambda: list(
+                    counted.filter(protest__city=city).values('protest').annotate(total=Count('pk'))
+                    .order_by('-total')[:top]
+                )),
+                ('trending', lambda: top_protests(top, now=now)),
+                ('trending ?city=', lambda: top_protests(top, city, now=now)),
+            )
+            for label, read in cases:
+                self.stdout.write(f'{label:<24}{self.time(read, options["repeat"]) * 1000:>10.2f} ms')
+
+            # One new user supports the first protests; each call is the support view's write path
+            user = CustomUser.objects.create_user(username=f'bench-trending-{time.time_ns()}')
+            supported = protest_ids[:options['updates']]
+            started = time.perf_counter()
+            for protest_id in supported:
+                set_support(user, protest_id, True)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'set_support: {elapsed / len(supported) * 1e6:.0f} us per support')
+
+            incremental = dict(TrendingScore.objects.filter(pk__in=supported).values_list('pk', 'score'))
+            rebalance(now)
+            rebuilt = dict(TrendingScore.objects.filter(pk__in=supported).values_list('pk', 'score'))
+            drift = max(abs(incremental[pk] - rebuilt[pk]) for pk in supported)
+            if drift > 1e-6:
+                raise CommandError(f'Incremental scores drift from rebalance() by {drift}')
+            self.stdout.write(f'incremental vs rebalance: max log-score difference {drift:.2e}')
+
+            transaction.set_rollback(True)
+
+    def generate(self, supports, protests, now):
+        start = now + timedelta(days=1)
+        cities = [key for key, _ in PAKISTAN_CITIES]
+        organizer = CustomUser.objects.create_user(username=f'bench-organizer-{time.time_ns()}')
+        created = Protest.objects.bulk_create((
+            Protest(
+                title=f'Trending {i}', description='Details', cause='water', organizer=organizer,
+                city=cities[i % len(cities)], specific_location='Saddar', status='upcoming',
+                start_datetime=start, end_datetime=start + timedelta(hours=2),
+            ) for i in range(protests)
+        ), batch_size=1000)
+        protest_ids = [protest.pk for protest in created]
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f'bench-supporter-{time.time_ns()}-{i}', password='!')
+            for i in range(math.ceil(supports / protests))
+        )
+        user_ids = [user.pk for user in users]
+
+        created_at = Support._meta.get_field('created_at')
+        week = 7 * 24 * 3600
+        stamps = [
+            created_at.get_db_prep_value(now - timedelta(seconds=i * week // TIMESTAMPS), connection)
+            for i in range(TIMESTAMPS)
+        ]
+        quote = connection.ops.quote_name
+        sql = (
+            f'INSERT INTO {quote(Support._meta.db_table)} '
+            f'({quote("user_id")}, {quote("protest_id")}, {quote("created_at")}) VALUES (%s, %s, %s)'
+        )
+        chunk = 50_000
+        with connection.cursor() as cursor:
+            for offset in range(0, supports, chunk):
+                cursor.executemany(sql, [
+                    (user_ids[i // protests], protest_ids[i % protests], stamps[(i * 7919) % TIMESTAMPS])
+                    for i in range(offset, min(offset + chunk, supports))
+                ])
+        return protest_ids
+
+    def time(self, read, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            read()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
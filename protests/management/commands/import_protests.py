@@ -0,0 +1,26 @@
+from core.importing import BulkImportCommand
+from protests import geo
+from protests.models import Protest
+from protests.serializers import ProtestImportSerializer
+
+
+class Command(BulkImportCommand):
+    help = 'Bulk import protests from CSV or JSON Lines; `organizer` is a username'
+    model = Protest
+    serializer_class = ProtestImportSerializer
+    user_field = 'organizer'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--allow-past', action='store_true', help='Accept protests that started in the past')
+
+    def get_serializer_context(self, options):
+        return {'allow_past': options['allow_past']}
+
+    def build_instance(self, attrs):
+        protest = Protest(**attrs)
+        # Done by Protest.save() and ProtestSerializer.create(), both skipped here
+        protest.geo_cell = geo.grid_cell(protest.latitude, protest.longitude)
+        if not protest.organizer_contact:
+            protest.organizer_contact = protest.organizer.phone_number or ''
+        return protest
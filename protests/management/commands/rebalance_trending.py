@@ -0,0 +1,14 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from protests.trending import rebalance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild trending scores from supports (see protests/trending.py); run from cron, e.g. hourly'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = rebalance()
+        self.stdout.write(f'{rows} trending score(s) rebuilt in {time.perf_counter() - started:.1f}s')
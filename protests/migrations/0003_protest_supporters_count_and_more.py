@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:04
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_supporters_count(apps, schema_editor):
+    Protest = apps.get_model('protests', 'Protest')
+    Support = apps.get_model('protests', 'Support')
+    counts = Support.objects.filter(protest=OuterRef('pk')).order_by().values('protest').annotate(
+        total=Count('pk')
+    ).values('total')
+    Protest.objects.update(supporters_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0002_protest_protest_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='protest',
+            name='supporters_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Supporters'),
+        ),
+        migrations.RunPython(backfill_supporters_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(fields=['supporters_count', 'id'], name='protest_supporters_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+from protests.geo import grid_cell
+
+
+def backfill_geo_cell(apps, schema_editor):
+    Protest = apps.get_model('protests', 'Protest')
+    located = Protest.objects.exclude(latitude=None).exclude(longitude=None)
+    for pk, latitude, longitude in located.values_list('pk', 'latitude', 'longitude').iterator():
+        Protest.objects.filter(pk=pk).update(geo_cell=grid_cell(latitude, longitude))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0003_protest_supporters_count_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='protest',
+            name='geo_cell',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_geo_cell, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0004_protest_geo_cell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_supporters_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['created_at', 'id'], name='protest_approved_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['city', 'created_at', 'id'], name='protest_approved_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['cause', 'created_at', 'id'], name='protest_approved_cause_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['supporters_count', 'id'], name='protest_approved_support_idx'),
+        ),
+    ]
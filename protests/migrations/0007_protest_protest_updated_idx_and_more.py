@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0006_protest_poster_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(fields=['updated_at', 'id'], name='protest_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='support',
+            index=models.Index(fields=['created_at', 'id'], name='support_created_idx'),
+        ),
+    ]
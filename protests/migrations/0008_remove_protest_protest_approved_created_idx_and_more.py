@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0007_protest_protest_updated_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_approved_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_approved_city_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_approved_cause_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='protest',
+            name='protest_approved_support_idx',
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), ('status', 'completed'), _connector='OR'), fields=['created_at', 'id'], name='protest_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), ('status', 'completed'), _connector='OR'), fields=['city', 'created_at', 'id'], name='protest_public_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), ('status', 'completed'), _connector='OR'), fields=['cause', 'created_at', 'id'], name='protest_public_cause_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'upcoming')), fields=['created_at', 'id'], name='protest_upcoming_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'ongoing')), fields=['created_at', 'id'], name='protest_ongoing_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), ('status', 'completed'), _connector='OR'), fields=['supporters_count', 'id'], name='protest_public_support_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), _connector='OR'), fields=['start_datetime'], name='protest_scheduled_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved'), ('status', 'upcoming'), ('status', 'ongoing'), _connector='OR'), fields=['end_datetime'], name='protest_scheduled_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='protest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['start_datetime'], name='protest_approved_start_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0008_remove_protest_protest_approved_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('protest', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='protests.protest')),
+                ('city', models.CharField(choices=[('islamabad', 'Islamabad'), ('rawalpindi', 'Rawalpindi'), ('karachi', 'Karachi'), ('lahore', 'Lahore'), ('faisalabad', 'Faisalabad'), ('multan', 'Multan'), ('peshawar', 'Peshawar'), ('quetta', 'Quetta'), ('sialkot', 'Sialkot'), ('gujranwala', 'Gujranwala'), ('bahawalpur', 'Bahawalpur'), ('sargodha', 'Sargodha'), ('sukkur', 'Sukkur'), ('larkana', 'Larkana'), ('hyderabad', 'Hyderabad'), ('abbottabad', 'Abbottabad'), ('mardan', 'Mardan'), ('kasur', 'Kasur'), ('dera ghazi khan', 'Dera Ghazi Khan'), ('sheikhupura', 'Sheikhupura')], max_length=50)),
+                ('score', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'Trending Score',
+                'verbose_name_plural': 'Trending Scores',
+                'indexes': [models.Index(fields=['score'], name='trending_score_idx'), models.Index(fields=['city', 'score'], name='trending_city_score_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,12 @@
+import operator
+from functools import reduce
+
 from django.db import models
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Substr
 from django.conf import settings
 from django.utils import timezone
+from . import geo
 
 # Pakistani cities (same as users)
 PAKISTAN_CITIES = [
@@ -44,6 +50,63 @@ PROTEST_CAUSES = [
     ('other', 'Other Issues'),
 ]
 
+# Characters of description sent as the list card summary
+SUMMARY_LENGTH = 200
+
+# Statuses shown publicly. Approval makes a protest public; from then on
+# `manage.py advance_protest_status` (protests/lifecycle.py) moves it through
+# upcoming -> ongoing -> completed as its start and end times pass.
+PUBLIC_STATUSES = ('approved', 'upcoming', 'ongoing', 'completed')
+# Statuses the lifecycle still has to move on
+SCHEDULED_STATUSES = ('approved', 'upcoming', 'ongoing')
+
+
+def status_in(statuses, lookup='status'):
+    """
+    status__in spelled as ORed equalities. SQLite uses a partial index only
+    when it can prove the query implies the index condition, and it can't
+    reason about an IN list of bound parameters.
+    """
+    return reduce(operator.or_, (Q(**{lookup: status}) for status in statuses))
+
+
+IS_PUBLIC = status_in(PUBLIC_STATUSES)
+
+class ProtestQuerySet(models.QuerySet):
+    def public(self):
+        return self.filter(IS_PUBLIC)
+
+    def with_support_stats(self, user=None):
+        """Load the organizer and annotate the viewer's is_supported state in the same query"""
+        queryset = self.select_related('organizer')
+        if user is not None and user.is_authenticated:
+            return queryset.annotate(is_supported=Exists(
+                Support.objects.filter(protest=OuterRef('pk'), user=user)
+            ))
+        return queryset.annotate(is_supported=Value(False))
+
+    def with_summary(self):
+        """Annotate the start of description as summary, computed by the database"""
+        return self.annotate(summary=Substr('description', 1, SUMMARY_LENGTH))
+
+    def near(self, latitude, longitude, radius_km):
+        """[(pk, distance_km)] of rows within radius_km of the point, nearest first"""
+        box = geo.bounding_box(latitude, longitude, radius_km)
+        in_cells = Q()
+        for first, last in geo.cell_ranges(box):
+            in_cells |= Q(geo_cell__range=(first, last))
+        candidates = self.filter(
+            in_cells, latitude__range=box[:2], longitude__range=box[2:]
+        ).order_by().values_list('pk', 'latitude', 'longitude')
+
+        nearby = []
+        for pk, lat, lng in candidates:
+            distance = geo.haversine_km(latitude, longitude, float(lat), float(lng))
+            if distance <= radius_km:
+                nearby.append((pk, distance))
+        nearby.sort(key=lambda item: item[1])
+        return nearby
+
 class Protest(models.Model):
     STATUS_CHOICES = [
         ('pending', '⏳ Pending Approval'),
@@ -74,6 +137,8 @@ class Protest(models.Model):
     specific_location = models.CharField(max_length=300, verbose_name="Specific Location/Venue")
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, verbose_name="Latitude")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, verbose_name="Longitude")
+    # Spatial key derived from latitude/longitude on save - see protests/geo.py
+    geo_cell = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
     
     # Date & Time
     start_datetime = models.DateTimeField(verbose_name="Start Date & Time")
@@ -92,6 +157,8 @@ class Protest(models.Model):
         null=True,
         verbose_name="Protest Poster/Flyer"
     )
+    # Downscaled WebP/JPEG copies of the poster - see core/images.py
+    poster_variants = models.JSONField(default=dict, blank=True, editable=False)
     supporting_documents = models.FileField(
         upload_to='protest_documents/', 
         blank=True, 
@@ -110,19 +177,54 @@ class Protest(models.Model):
     
     # Statistics
     views_count = models.PositiveIntegerField(default=0, verbose_name="Total Views")
+    # Maintained by support_protest; `manage.py repair_counters` fixes drift
+    supporters_count = models.PositiveIntegerField(default=0, verbose_name="Supporters")
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     verified_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ProtestQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} - {self.get_city_display()}"
 
+    def save(self, *args, **kwargs):
+        self.geo_cell = geo.grid_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'geo_cell'}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Protest"
         verbose_name_plural = "Protests"
         ordering = ['-created_at']
+        # Partial indexes over the publicly listed rows only, one per ProtestListView
+        # access path; (key, id) suffixes double as keyset pagination seek keys
+        indexes = [
+            models.Index(fields=['created_at', 'id'], condition=IS_PUBLIC, name='protest_public_created_idx'),
+            models.Index(fields=['city', 'created_at', 'id'], condition=IS_PUBLIC, name='protest_public_city_idx'),
+            models.Index(fields=['cause', 'created_at', 'id'], condition=IS_PUBLIC, name='protest_public_cause_idx'),
+            # ?status=upcoming/ongoing; a (status, ...) index would tempt SQLite
+            # into seeking every public status and sorting for plain lists
+            models.Index(fields=['created_at', 'id'], condition=Q(status='upcoming'), name='protest_upcoming_created_idx'),
+            models.Index(fields=['created_at', 'id'], condition=Q(status='ongoing'), name='protest_ongoing_created_idx'),
+            # "Most supported" ordering
+            models.Index(fields=['supporters_count', 'id'], condition=IS_PUBLIC, name='protest_public_support_idx'),
+            # Due lifecycle transitions (protests/lifecycle.py): range reads on start and end time
+            models.Index(
+                fields=['start_datetime'], condition=status_in(SCHEDULED_STATUSES), name='protest_scheduled_start_idx',
+            ),
+            models.Index(
+                fields=['end_datetime'], condition=status_in(SCHEDULED_STATUSES), name='protest_scheduled_end_idx',
+            ),
+            # Newly approved protests, until the lifecycle picks them up
+            models.Index(fields=['start_datetime'], condition=Q(status='approved'), name='protest_approved_start_idx'),
+            # Incremental exports (?updated_since=)
+            models.Index(fields=['updated_at', 'id'], name='protest_updated_idx'),
+        ]
 
     def is_upcoming(self):
         return self.start_datetime > timezone.now()
@@ -144,6 +246,32 @@ class Support(models.Model):
         unique_together = ['user', 'protest']  # Prevent duplicate supports
         verbose_name = "Support"
         verbose_name_plural = "Supports"
+        indexes = [
+            # Incremental exports (?updated_since=)
+            models.Index(fields=['created_at', 'id'], name='support_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} supports {self.protest.title}"
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed support score of a protest, maintained by protests/trending.py.
+    `score` is a log-sum: ordering by it orders by decayed supporters.
+    """
+    protest = models.OneToOneField(Protest, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    # Copied from the protest so ?city= reads one index; resynced by rebalance
+    city = models.CharField(max_length=50, choices=PAKISTAN_CITIES)
+    score = models.FloatField()
+
+    class Meta:
+        verbose_name = "Trending Score"
+        verbose_name_plural = "Trending Scores"
+        indexes = [
+            # /trending/ top-K, overall and per city
+            models.Index(fields=['score'], name='trending_score_idx'),
+            models.Index(fields=['city', 'score'], name='trending_city_score_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} supports {self.protest.title}"
\ No newline at end of file
+        return f"{self.protest_id}: {self.score}"
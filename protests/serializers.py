@@ -1,21 +1,40 @@
 from rest_framework import serializers
-from .models import Protest, Support
+from .models import SUMMARY_LENGTH, Protest, Support
 from django.utils import timezone
+from core.serializers import ImageVariantsField, ImportedUserField, SparseFieldsetMixin
 
-class ProtestSerializer(serializers.ModelSerializer):
+def check_organizer(user):
+    """Role and profile rules every protest creator must meet"""
+    if getattr(user, 'role', None) != 'organizer':
+        raise serializers.ValidationError('Only organizers can create protests.')
+
+    missing_fields = []
+    required_profile_fields = ['city', 'phone_number', 'bio']
+    for field in required_profile_fields:
+        if not getattr(user, field, None):
+            missing_fields.append(field)
+    if missing_fields:
+        raise serializers.ValidationError({
+            'profile': f"Please complete your profile before creating a protest. Missing: {', '.join(missing_fields)}"
+        })
+
+class ProtestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     organizer_name = serializers.CharField(source='organizer.username', read_only=True)
-    supporter_count = serializers.SerializerMethodField()
+    supporter_count = serializers.IntegerField(source='supporters_count', read_only=True)
     is_supported = serializers.SerializerMethodField()
+    poster_variants = ImageVariantsField()
+    # Method fields backed by a same-named queryset annotation (core/fastpath.py)
+    annotated_fields = ('is_supported',)
     
     class Meta:
         model = Protest
-        fields = '__all__'
+        exclude = ('supporters_count', 'geo_cell')
         read_only_fields = ('organizer', 'status', 'is_verified', 'views_count')
     
-    def get_supporter_count(self, obj):
-        return obj.supports.count()
-    
     def get_is_supported(self, obj):
+        # Annotated by Protest.objects.with_support_stats() on the list/detail views
+        if hasattr(obj, 'is_supported'):
+            return obj.is_supported
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Support.objects.filter(protest=obj, user=request.user).exists()
@@ -25,27 +44,16 @@ class ProtestSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError('Authentication required.')
+        check_organizer(request.user)
+        return self.validate_schedule(attrs)
 
-        user = request.user
-        if getattr(user, 'role', None) != 'organizer':
-            raise serializers.ValidationError('Only organizers can create protests.')
-
-        missing_fields = []
-        required_profile_fields = ['city', 'phone_number', 'bio']
-        for field in required_profile_fields:
-            if not getattr(user, field, None):
-                missing_fields.append(field)
-        if missing_fields:
-            raise serializers.ValidationError({
-                'profile': f"Please complete your profile before creating a protest. Missing: {', '.join(missing_fields)}"
-            })
-
-        # Ensure start is before end and in the future
+    def validate_schedule(self, attrs):
+        # Ensure start is before end and, unless importing history, in the future
         start = attrs.get('start_datetime')
         end = attrs.get('end_datetime')
         if start and end and start >= end:
             raise serializers.ValidationError({'end_datetime': 'End time must be after start time.'})
-        if start and start < timezone.now():
+        if start and start < timezone.now() and not self.context.get('allow_past'):
             raise serializers.ValidationError({'start_datetime': 'Start time must be in the future.'})
         return attrs
 
@@ -56,6 +64,36 @@ class ProtestSerializer(serializers.ModelSerializer):
             validated_data['organizer_contact'] = validated_data['organizer'].phone_number or ''
         return super().create(validated_data)
 
+class ProtestListSerializer(ProtestSerializer):
+    """Compact collection row: what the ProtestList cards render, with a summary instead of the description"""
+    summary = serializers.SerializerMethodField()
+    annotated_fields = ('is_supported', 'summary')
+
+    class Meta(ProtestSerializer.Meta):
+        exclude = None
+        fields = (
+            'id', 'title', 'summary', 'cause', 'city', 'start_datetime', 'end_datetime',
+            'status', 'is_verified', 'organizer_name', 'supporter_count', 'is_supported',
+            'poster', 'poster_variants', 'created_at',
+        )
+
+    def get_summary(self, obj):
+        # Annotated by Protest.objects.with_summary() on the list views
+        if hasattr(obj, 'summary'):
+            return obj.summary
+        return obj.description[:SUMMARY_LENGTH]
+
+class ProtestImportSerializer(ProtestSerializer):
+    """Row validation for `manage.py import_protests`: the organizer is named in the row"""
+    organizer = ImportedUserField()
+
+    class Meta(ProtestSerializer.Meta):
+        read_only_fields = ('views_count',)
+
+    def validate(self, attrs):
+        check_organizer(attrs['organizer'])
+        return self.validate_schedule(attrs)
+
 class SupportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Support
@@ -1,3 +1,504 @@
+import base64
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.viewcounts import ViewCounter
+from users.models import CustomUser
+from . import geo, trending, views as protest_views
+from .lifecycle import advance_statuses, next_transition
+from .models import Protest, Support, TrendingScore
+from .trending import rebalance
+
+
+def make_protest(organizer, **kwargs):
+    start = timezone.now() + timedelta(days=1)
+    defaults = {
+        'title': 'Protest',
+        'description': 'Details',
+        'cause': 'education',
+        'organizer': organizer,
+        'city': 'lahore',
+        'specific_location': 'Liberty Chowk',
+        'start_datetime': start,
+        'end_datetime': start + timedelta(hours=3),
+        'status': 'approved',
+    }
+    defaults.update(kwargs)
+    return Protest.objects.create(**defaults)
+
+
+class ProtestListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+        self.viewer = CustomUser.objects.create_user(username='viewer', password='pass12345')
+
+    def add_protests(self, count):
+        # Cache versions are bumped on commit, which TestCase otherwise never reaches
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                protest = make_protest(self.organizer, title=f'Protest {i}', supporters_count=1 + i % 2)
+                Support.objects.create(user=self.organizer, protest=protest)
+                if i % 2:
+                    Support.objects.create(user=self.viewer, protest=protest)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('protest-list'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_anonymous_list_query_count_is_constant(self):
+        self.add_protests(2)
+        small = self.count_list_queries()
+        self.add_protests(10)
+        self.assertEqual(self.count_list_queries(), small)
+
+    def test_authenticated_list_query_count_is_constant(self):
+        self.client.force_authenticate(self.viewer)
+        self.add_protests(2)
+        small = self.count_list_queries()
+        self.add_protests(10)
+        self.assertEqual(self.count_list_queries(), small)
+
+    def test_list_reports_supporter_count_and_viewer_state(self):
+        self.add_protests(2)
+        self.client.force_authenticate(self.viewer)
+        response = self.client.get(reverse('protest-list'))
+        rows = {row['title']: row for row in response.json()['results']}
+        self.assertEqual(rows['Protest 0']['supporter_count'], 1)
+        self.assertFalse(rows['Protest 0']['is_supported'])
+        self.assertEqual(rows['Protest 1']['supporter_count'], 2)
+        self.assertTrue(rows['Protest 1']['is_supported'])
+        self.assertEqual(rows['Protest 1']['organizer_name'], 'organizer')
+
+    def test_detail_uses_single_query(self):
+        self.add_protests(1)
+        protest = Protest.objects.get()
+        with self.assertNumQueries(1), mock.patch('core.viewcounts._counter', ViewCounter(flush_interval=None)):
+            response = self.client.get(reverse('protest-detail', args=[protest.pk]))
+        self.assertEqual(response.json()['supporter_count'], 1)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+        make_protest(self.organizer, description='x' * 500, safety_guidelines='Stay calm')
+
+    def get_list(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('protest-list'), params)
+        return response, ' '.join(query['sql'] for query in ctx.captured_queries)
+
+    def test_compact_rows_by_default(self):
+        response, sql = self.get_list()
+        row = response.json()['results'][0]
+        self.assertEqual(len(row['summary']), 200)
+        self.assertEqual(row['organizer_name'], 'organizer')
+        self.assertNotIn('description', row)
+        self.assertNotIn('safety_guidelines', sql)
+        self.assertNotIn('verification_notes', sql)
+
+    def test_fields_selects_from_the_full_representation(self):
+        response, sql = self.get_list(fields='id,safety_guidelines')
+        self.assertEqual(response.json()['results'][0], {'id': Protest.objects.get().pk, 'safety_guidelines': 'Stay calm'})
+        self.assertNotIn('"title"', sql)
+        self.assertNotIn('users_customuser', sql)
+
+    def test_omit(self):
+        response, _ = self.get_list(omit='summary,poster,poster_variants')
+        row = response.json()['results'][0]
+        self.assertNotIn('summary', row)
+        self.assertIn('title', row)
+
+    def test_unknown_field_is_rejected(self):
+        response, _ = self.get_list(fields='id,nope')
+        self.assertEqual(response.status_code, 400)
+
+
+class ProtestListPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+
+    def test_cursor_walks_every_row_once_including_timestamp_ties(self):
+        protests = [make_protest(self.organizer, title=f'Protest {i}') for i in range(7)]
+        # Force ties on created_at so the id tiebreaker has to do the work
+        Protest.objects.filter(pk__in=[p.pk for p in protests[2:5]]).update(created_at=protests[2].created_at)
+
+        seen = []
+        url = reverse('protest-list') + '?page_size=2'
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 2)
+            seen.extend(row['id'] for row in data['results'])
+            url = data['next']
+        expected = list(Protest.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('protest-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+        payloads = (b'[null,1]', b'["2024-01-01T00:00:00Z",1e400]', b'[1e400,1]')
+        for payload in payloads:
+            cursor = base64.urlsafe_b64encode(payload).decode('ascii')
+            for params in ({}, {'ordering': '-supporters_count'}):
+                with self.subTest(payload=payload, params=params):
+                    response = self.client.get(reverse('protest-list'), {**params, 'cursor': cursor})
+                    self.assertEqual(response.status_code, 404)
+
+
+class SupportCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+        self.client.force_authenticate(self.organizer)
+        self.protest = make_protest(self.organizer)
+
+    def test_toggle_maintains_counter(self):
+        url = reverse('support-protest', args=[self.protest.pk])
+        self.client.post(url)
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.supporters_count, 1)
+        self.client.post(url)
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.supporters_count, 0)
+
+    def test_put_and_delete_are_idempotent(self):
+        url = reverse('support-protest', args=[self.protest.pk])
+        for method, supported, count in (('put', True, 1), ('put', True, 1), ('delete', False, 0), ('delete', False, 0)):
+            response = getattr(self.client, method)(url)
+            self.assertEqual(response.json(), {'supported': supported})
+            self.protest.refresh_from_db()
+            self.assertEqual(self.protest.supporters_count, count)
+            self.assertEqual(Support.objects.filter(protest=self.protest).exists(), supported)
+        missing = reverse('support-protest', args=[self.protest.pk + 100])
+        self.assertEqual(self.client.put(missing).status_code, 404)
+        self.assertEqual(self.client.delete(missing).status_code, 404)
+
+    def test_support_invalidates_cached_lists(self):
+        self.client.force_authenticate(None)
+        url = reverse('protest-list')
+        self.assertEqual(self.client.get(url).json()['results'][0]['supporter_count'], 0)
+        self.client.force_authenticate(self.organizer)
+        self.client.put(reverse('support-protest', args=[self.protest.pk]))
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(url).json()['results'][0]['supporter_count'], 1)
+
+    def test_support_state(self):
+        other = make_protest(self.organizer, title='Other')
+        Support.objects.create(user=self.organizer, protest=other)
+        url = reverse('support-state')
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {'ids': [self.protest.pk, other.pk, 999]}, format='json')
+        self.assertEqual(response.json(), {'supported': {str(self.protest.pk): False, str(other.pk): True, '999': False}})
+        self.assertEqual(self.client.post(url, {'ids': ['1']}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'ids': list(range(101))}, format='json').status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(url, {'ids': [1]}, format='json').status_code, 401)
+
+    def test_deleting_users_and_admin_deletes_keep_counter(self):
+        supporters = [CustomUser.objects.create_user(username=f'supporter{i}') for i in range(3)]
+        for user in supporters:
+            self.client.force_authenticate(user)
+            self.client.put(reverse('support-protest', args=[self.protest.pk]))
+        supporters[0].delete()
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.supporters_count, 2)
+
+        admin = CustomUser.objects.create_superuser(username='admin', password='pass12345', email='a@example.com')
+        self.client.force_login(admin)
+        support = Support.objects.get(user=supporters[1])
+        response = self.client.post(
+            reverse('admin:protests_support_delete', args=[support.pk]), {'post': 'yes'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.supporters_count, 1)
+        self.assertEqual(Support.objects.count(), 1)
+
+    def test_repair_counters_fixes_drift(self):
+        Support.objects.create(user=self.organizer, protest=self.protest)
+        with self.assertRaises(CommandError):
+            call_command('repair_counters', '--check', stdout=StringIO())
+        call_command('repair_counters', stdout=StringIO())
+        self.protest.refresh_from_db()
+        self.assertEqual(self.protest.supporters_count, 1)
+        call_command('repair_counters', '--check', stdout=StringIO())
+
+    def test_most_supported_ordering(self):
+        popular = make_protest(self.organizer, title='Popular', supporters_count=5)
+        response = self.client.get(reverse('protest-list') + '?ordering=-supporters_count')
+        self.assertEqual(response.json()['results'][0]['id'], popular.pk)
+
+
+class NearbyProtestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+
+    def test_returns_protests_within_radius_nearest_first(self):
+        # Around Islamabad's Blue Area (33.7077, 73.0498)
+        near = make_protest(self.organizer, title='F-9 Park', latitude='33.7000', longitude='73.0300')
+        nearest = make_protest(self.organizer, title='Blue Area', latitude='33.7080', longitude='73.0500')
+        make_protest(self.organizer, title='Lahore', latitude='31.5497', longitude='74.3436')
+        make_protest(self.organizer, title='Pending', latitude='33.7077', longitude='73.0498', status='pending')
+        make_protest(self.organizer, title='No location')
+
+        response = self.client.get(reverse('protest-nearby'), {'lat': 33.7077, 'lng': 73.0498, 'radius_km': 5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()], [nearest.pk, near.pk])
+        self.assertLess(response.json()[0]['distance_km'], 0.1)
+
+    def test_protest_deleted_after_distance_query_is_skipped(self):
+        kept = make_protest(self.organizer, title='Kept', latitude='33.7080', longitude='73.0500')
+        deleted = make_protest(self.organizer, title='Deleted', latitude='33.7000', longitude='73.0300')
+        nearby = Protest.objects.public().near(33.7077, 73.0498, 5)
+        deleted.delete()
+        with mock.patch('protests.models.ProtestQuerySet.near', return_value=nearby):
+            response = self.client.get(reverse('protest-nearby'), {'lat': 33.7077, 'lng': 73.0498, 'radius_km': 5})
+        self.assertEqual([row['title'] for row in response.json()], ['Kept'])
+        self.assertLess(response.json()[0]['distance_km'], 0.1)
+
+    def test_geo_cell_follows_location_updates(self):
+        protest = make_protest(self.organizer, latitude='24.8607', longitude='67.0011')
+        karachi_cell = protest.geo_cell
+        protest.latitude, protest.longitude = '31.5497', '74.3436'
+        protest.save(update_fields=['latitude', 'longitude'])
+        protest.refresh_from_db()
+        self.assertNotEqual(protest.geo_cell, karachi_cell)
+
+    def test_rejects_bad_parameters(self):
+        url = reverse('protest-nearby')
+        self.assertEqual(self.client.get(url, {'lat': 'x', 'lng': 73}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'lat': 33, 'lng': 73, 'radius_km': 5000}).status_code, 400)
+
+
+class LifecycleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345', role='organizer')
+        self.now = timezone.now()
+
+    def scheduled(self, status, starts_in, hours=2):
+        start = self.now + timedelta(hours=starts_in)
+        return make_protest(self.organizer, status=status, start_datetime=start, end_datetime=start + timedelta(hours=hours))
+
+    def test_due_transitions_are_applied(self):
+        future = self.scheduled('approved', starts_in=5)
+        started = self.scheduled('approved', starts_in=-1)
+        starting = self.scheduled('upcoming', starts_in=-0.5)
+        ended = self.scheduled('ongoing', starts_in=-3)
+        missed = self.scheduled('approved', starts_in=-5)
+        pending = self.scheduled('pending', starts_in=-1)
+        cancelled = self.scheduled('cancelled', starts_in=-3)
+
+        moved = advance_statuses(self.now)
+        self.assertEqual(moved, {'completed': 2, 'ongoing': 2, 'upcoming': 1})
+        expected = {
+            future: 'upcoming', started: 'ongoing', starting: 'ongoing', ended: 'completed',
+            missed: 'completed', pending: 'pending', cancelled: 'cancelled',
+        }
+        for protest, status in expected.items():
+            protest.refresh_from_db()
+            self.assertEqual(protest.status, status, protest.start_datetime)
+            if status not in ('pending', 'cancelled'):
+                self.assertEqual(protest.updated_at, self.now)
+        self.assertEqual(advance_statuses(self.now), {'completed': 0, 'ongoing': 0, 'upcoming': 0})
+
+    def test_next_transition(self):
+        self.assertIsNone(next_transition(self.now))
+        self.scheduled('upcoming', starts_in=5)
+        ongoing = self.scheduled('ongoing', starts_in=-1, hours=3)
+        self.assertEqual(next_transition(self.now), ongoing.end_datetime)
+
+    def test_lists_follow_status_changes(self):
+        live = self.scheduled('approved', starts_in=-1)
+        self.scheduled('upcoming', starts_in=5)
+        self.scheduled('rejected', starts_in=5)
+        url = reverse('protest-list')
+        self.assertEqual(len(self.client.get(url).json()['results']), 2)
+        self.assertEqual(self.client.get(url, {'status': 'ongoing'}).json()['results'], [])
+
+        call_command('advance_protest_status', stdout=StringIO())
+        rows = self.client.get(url, {'status': 'ongoing'}).json()['results']
+        self.assertEqual([row['id'] for row in rows], [live.pk])
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.supporters = [
+            CustomUser.objects.create_user(username=f'supporter{i}', password='pass12345') for i in range(3)
+        ]
+        self.url = reverse('protest-trending')
+
+    def support(self, protest, users, method='put'):
+        for user in users:
+            self.client.force_authenticate(user)
+            getattr(self.client, method)(reverse('support-protest', args=[protest.pk]))
+        self.client.force_authenticate(None)
+
+    def trending(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()]
+
+    def test_supports_move_scores_incrementally(self):
+        karachi = make_protest(self.organizer, title='Karachi', city='karachi')
+        lahore = make_protest(self.organizer, title='Lahore')
+        self.support(karachi, self.supporters[:2])
+        self.support(lahore, self.supporters[:1])
+        self.assertEqual(self.trending(), ['Karachi', 'Lahore'])
+        self.assertEqual(self.trending(city='lahore'), ['Lahore'])
+        self.assertAlmostEqual(self.client.get(self.url).json()[0]['trending_score'], 2, places=2)
+
+        self.support(karachi, self.supporters[:2], method='delete')
+        self.assertEqual(self.trending(), ['Lahore'])
+        self.support(karachi, self.supporters)
+        self.assertEqual(self.trending(), ['Karachi', 'Lahore'])
+
+    def test_rebalance_decays_older_supports_and_drops_finished_protests(self):
+        older = make_protest(self.organizer, title='Older')
+        recent = make_protest(self.organizer, title='Recent')
+        finished = make_protest(self.organizer, title='Finished', status='completed')
+        make_protest(self.organizer, title='Unsupported')
+        for user in self.supporters:
+            Support.objects.create(user=user, protest=older)
+            Support.objects.create(user=user, protest=finished)
+        Support.objects.filter(protest=older).update(created_at=timezone.now() - timedelta(days=2))
+        Support.objects.create(user=self.supporters[0], protest=recent)
+
+        self.assertEqual(rebalance(), 2)
+        self.assertEqual(TrendingScore.objects.count(), 2)
+        self.assertFalse(TrendingScore.objects.filter(pk=finished.pk).exists())
+        # Three supports two half-lives old weigh less than one new support
+        rows = self.client.get(self.url).json()
+        self.assertEqual([row['title'] for row in rows], ['Recent', 'Older'])
+        self.assertAlmostEqual(rows[1]['trending_score'], 0.75, places=2)
+
+    def test_protest_deleted_after_ranking_is_skipped(self):
+        kept = make_protest(self.organizer, title='Kept')
+        deleted = make_protest(self.organizer, title='Deleted')
+        self.support(kept, self.supporters[:1])
+        self.support(deleted, self.supporters[:2])
+        ranked = trending.top_protests(10)
+        deleted.delete()
+        with mock.patch.object(protest_views, 'top_protests', return_value=ranked):
+            self.assertEqual(self.trending(), ['Kept'])
+
+    def test_rejects_bad_parameters(self):
+        for params in ({'city': 'atlantis'}, {'limit': 0}, {'limit': 'x'}, {'limit': 101}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+
+class ImportProtestsTests(TestCase):
+    def setUp(self):
+        self.organizer = CustomUser.objects.create_user(
+            username='organizer', password='pass12345', role='organizer',
+            city='karachi', phone_number='03001234567', bio='Organizer',
+        )
+        CustomUser.objects.create_user(username='member', password='pass12345')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'protests.csv')
+
+    def write_csv(self, rows):
+        header = 'title,description,cause,organizer,city,specific_location,latitude,longitude,start_datetime,end_datetime\n'
+        with open(self.path, 'w') as source:
+            source.write(header + ''.join(row + '\n' for row in rows))
+
+    def test_valid_rows_are_imported_and_bad_rows_rejected(self):
+        self.write_csv([
+            'Water rally,Clean water now,water,organizer,karachi,Saddar,24.86,67.01,2030-01-01T10:00Z,2030-01-01T12:00Z',
+            'No coords,Still valid,education,organizer,lahore,Mall Road,,,2030-02-01T10:00Z,2030-02-01T12:00Z',
+            'Unknown,Bad organizer,water,ghost,karachi,Saddar,,,2030-01-01T10:00Z,2030-01-01T12:00Z',
+            'Member,Not an organizer,water,member,karachi,Saddar,,,2030-01-01T10:00Z,2030-01-01T12:00Z',
+            'Past,Already happened,water,organizer,karachi,Saddar,,,2020-01-01T10:00Z,2020-01-01T12:00Z',
+        ])
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('import_protests', self.path, '--batch-size', '100', stdout=StringIO())
+        inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        imported = Protest.objects.order_by('title')
+        self.assertEqual([p.title for p in imported], ['No coords', 'Water rally'])
+        rally = imported[1]
+        self.assertEqual(rally.geo_cell, geo.grid_cell(24.86, 67.01))
+        self.assertEqual(rally.organizer_contact, '03001234567')
+        self.assertIsNone(imported[0].geo_cell)
+
+        with open(f'{self.path}.rejects.jsonl') as rejects:
+            rejected = [json.loads(line) for line in rejects]
+        self.assertEqual([r['line'] for r in rejected], [4, 5, 6])
+        self.assertIn('organizer', rejected[0]['errors'])
+        self.assertIn('start_datetime', rejected[2]['errors'])
+
+    def test_allow_past_accepts_historical_rows(self):
+        self.write_csv(['Past,Already happened,water,organizer,karachi,Saddar,,,2020-01-01T10:00Z,2020-01-01T12:00Z'])
+        call_command('import_protests', self.path, '--allow-past', stdout=StringIO())
+        self.assertEqual(Protest.objects.count(), 1)
+        self.assertFalse(os.path.exists(f'{self.path}.rejects.jsonl'))
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(username='admin', password='pass12345', is_staff=True)
+        self.organizer = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.old = make_protest(self.organizer, title='Old')
+        self.new = make_protest(self.organizer, title='New, "quoted"')
+        Protest.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        Support.objects.create(user=self.admin, protest=self.new)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+        self.assertEqual(client.get(reverse('protest-export')).status_code, 403)
+
+    def test_ndjson_streams_rows_in_timestamp_order(self):
+        response = self.client.get(reverse('protest-export'))
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Old', 'New, "quoted"'])
+        self.assertEqual(rows[1]['organizer'], 'organizer')
+
+    def test_incremental_csv(self):
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get(reverse('protest-export'), {'fmt': 'csv', 'updated_since': since})
+        lines = self.read(response).splitlines()
+        self.assertTrue(lines[0].startswith('id,title,description'))
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"New, ""quoted"""', lines[1])
+        self.assertIn('X-Export-Watermark', response)
+
+        response = self.client.get(reverse('support-export'), {'updated_since': response['X-Export-Watermark']})
+        self.assertEqual(self.read(response), '')
 
-# Create your tests here.
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get(reverse('protest-export'), {'fmt': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('protest-export'), {'updated_since': 'yesterday'}).status_code, 400)
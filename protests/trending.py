@@ -0,0 +1,153 @@
+"""
+Trending protests: supports weighted by age, halving every HALF_LIFE_HOURS.
+
+A protest's trending score is sum(2 ** (-(now - supported_at) / half_life))
+over its supports. Each support's weight keeps falling, but every protest's
+sum is divided by the same amount as `now` moves, so the ranking only changes
+when supports are added or removed. TrendingScore therefore stores
+
+    score = log(sum(exp(lam * (supported_at - ORIGIN))))
+
+with lam = ln 2 / half_life. This is the same ranking without any `now`, so
+the top-K is a plain read of the score index. A new support moves the
+protest's score with one log-add-exp UPDATE, and a withdrawn one with the
+matching log-subtract. The log form never overflows however far time runs
+past ORIGIN.
+
+rebalance() (`manage.py rebalance_trending`, from cron) rebuilds the table
+from Support. It drops protests that are no longer scheduled or whose
+supports have all decayed away, and resyncs cities. It also clears rounding
+drift and supports changed outside set_support(), such as cascades and the
+admin. After changing HALF_LIFE_HOURS, run it again: stored scores depend on
+lam.
+"""
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from core.reactions import set_reaction
+from .models import SCHEDULED_STATUSES, Protest, Support, TrendingScore, status_in
+
+DEFAULTS = {
+    'HALF_LIFE_HOURS': 24,
+    # rebalance() ignores supports older than this many half-lives (weight < 1e-9)
+    'HORIZON_HALF_LIVES': 30,
+}
+
+ORIGIN = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+# Score of a row whose supports were all withdrawn; far below any real score
+EMPTY = -1e9
+# exp() arguments are clamped here: PostgreSQL raises on underflow
+EXP_FLOOR = -700.0
+
+
+def options():
+    return {**DEFAULTS, **getattr(settings, 'TRENDING', {})}
+
+
+def decay_rate():
+    """lam, per second"""
+    return math.log(2) / (options()['HALF_LIFE_HOURS'] * 3600)
+
+
+def log_weight(at):
+    return decay_rate() * (at - ORIGIN).total_seconds()
+
+
+def decayed(score, now):
+    """A stored score as decayed supporters at `now`"""
+    return math.exp(score - log_weight(now))
+
+
+def _log_add(weight):
+    return Greatest(F('score'), Value(weight)) + Ln(
+        Value(1.0) + Exp(Greatest(-Abs(F('score') - Value(weight)), Value(EXP_FLOOR)))
+    )
+
+
+def _log_subtract(weight):
+    remaining = F('score') + Ln(Value(1.0) - Exp(Greatest(Value(weight) - F('score'), Value(EXP_FLOOR))))
+    # Withdrawing the last support leaves (up to rounding) nothing
+    return Case(When(score__gt=weight + 1e-9, then=remaining), default=Value(EMPTY))
+
+
+def record_support(protest_id, supported_at, added):
+    """Move protest_id's score by one support given (added) or withdrawn at supported_at"""
+    weight = log_weight(supported_at)
+    scores = TrendingScore.objects.filter(pk=protest_id)
+    if not added:
+        scores.update(score=_log_subtract(weight))
+        return
+    if not scores.update(score=_log_add(weight)):
+        city = Protest.objects.filter(pk=protest_id).values_list('city', flat=True).first()
+        if city is None:
+            return
+        # A concurrent first support may insert the row too; both then add to it
+        TrendingScore.objects.bulk_create(
+            [TrendingScore(protest_id=protest_id, city=city, score=EMPTY)], ignore_conflicts=True,
+        )
+        scores.update(score=_log_add(weight))
+
+
+def set_support(user, protest_id, supported):
+    """set_reaction() for Support that keeps the protest's trending score in step"""
+    if supported:
+        supported_at = timezone.now()
+    else:
+        # Read before the transaction: SQLite can't upgrade a read transaction
+        # to a write once another connection has written
+        supported_at = Support.objects.filter(user=user, protest_id=protest_id).values_list(
+            'created_at', flat=True
+        ).first()
+    with transaction.atomic():
+        changed = set_reaction(Support, 'protest', 'supporters_count', user, protest_id, supported)
+        if changed and supported_at is not None:
+            record_support(protest_id, supported_at, supported)
+    return changed
+
+
+def top_protests(limit, city=None, now=None):
+    """[(protest id, decayed supporters)] of the highest scored scheduled protests, best first"""
+    scores = TrendingScore.objects.filter(status_in(SCHEDULED_STATUSES, 'protest__status'), score__gt=EMPTY)
+    if city is not None:
+        scores = scores.filter(city=city)
+    now = now or timezone.now()
+    ranked = scores.order_by('-score', '-protest_id').values_list('protest_id', 'score')[:limit]
+    return [(pk, decayed(score, now)) for pk, score in ranked]
+
+
+def _log_sum(weights):
+    top = max(weights)
+    return top + math.log(sum(math.exp(weight - top) for weight in weights))
+
+
+def rebalance(now=None, batch_size=1000):
+    """Rebuild TrendingScore from the supports of scheduled protests; returns rows written"""
+    now = now or timezone.now()
+    lam = decay_rate()
+    horizon = now - timedelta(hours=options()['HALF_LIFE_HOURS'] * options()['HORIZON_HALF_LIVES'])
+    scheduled = Protest.objects.filter(status_in(SCHEDULED_STATUSES))
+    supports = Support.objects.filter(
+        status_in(SCHEDULED_STATUSES, 'protest__status'), created_at__gte=horizon,
+    ).order_by('protest_id').values_list('protest_id', 'created_at')
+
+    scores = {}
+    for protest_id, group in groupby(supports.iterator(chunk_size=10000), key=lambda row: row[0]):
+        scores[protest_id] = _log_sum([lam * (at - ORIGIN).total_seconds() for _, at in group])
+    cities = dict(scheduled.values_list('pk', 'city')) if scores else {}
+    rows = [
+        TrendingScore(protest_id=pk, city=cities[pk], score=score)
+        for pk, score in scores.items() if pk in cities
+    ]
+
+    # Support changes racing the rebuild are lost until the next rebalance
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path('', views.ProtestListView.as_view(), name='protest-list'),
+    path('nearby/', views.NearbyProtestListView.as_view(), name='protest-nearby'),
+    path('trending/', views.TrendingProtestListView.as_view(), name='protest-trending'),
+    path('export/', views.export_protests, name='protest-export'),
+    path('support-state/', views.support_state, name='support-state'),
+    path('supports/export/', views.export_supports, name='support-export'),
     path('<int:pk>/', views.ProtestDetailView.as_view(), name='protest-detail'),
     path('<int:protest_id>/support/', views.support_protest, name='support-protest'),
 ]
\ No newline at end of file
@@ -2,14 +2,52 @@ from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Protest, Support
-from .serializers import ProtestSerializer, SupportSerializer
+from core.cache import VersionedCacheMixin
+from core.conditional import ConditionalRetrieveMixin
+from core.exports import export_response
+from core.fastpath import FastListMixin
+from core.serializers import model_columns
+from core.viewcounts import record_view
+from .geo import MAX_RADIUS_KM
+from .models import PAKISTAN_CITIES, Protest, Support
+from .trending import set_support, top_protests
+from .serializers import ProtestListSerializer, ProtestSerializer, SupportSerializer
 
-class ProtestListView(generics.ListCreateAPIView):
-    queryset = Protest.objects.filter(status='approved')
+# Largest id list support_state answers, one page at the largest page size
+SUPPORT_STATE_MAX_IDS = 100
+
+def narrow_to_serializer(queryset, serializer, extra_columns=()):
+    """Read only the columns serializer renders (plus extra_columns, e.g. pagination keys)"""
+    if 'summary' in serializer.fields:
+        queryset = queryset.with_summary()
+    columns = model_columns(serializer)
+    # Join only the relations still rendered; only() refuses to defer a select_related FK
+    relations = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns, *extra_columns)
+
+class ProtestListView(VersionedCacheMixin, FastListMixin, generics.ListCreateAPIView):
+    queryset = Protest.objects.public()
     serializer_class = ProtestSerializer
+    cache_models = [Protest, Support]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['city', 'cause', 'status']
+    keyset_ordering_fields = ['created_at', 'supporters_count']
+    
+    def get_serializer_class(self):
+        # Compact rows unless the client picks its own ?fields=
+        if self.request.method == 'GET' and 'fields' not in self.request.query_params:
+            return ProtestListSerializer
+        return ProtestSerializer
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().with_support_stats(self.request.user)
+        # GET lists read .values() of just the rendered columns; see FastListMixin
+        if self.request.method == 'GET' and 'summary' in self.get_list_plan().fields:
+            queryset = queryset.with_summary()
+        return queryset
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -19,27 +57,171 @@ class ProtestListView(generics.ListCreateAPIView):
     def get_serializer_context(self):
         return {'request': self.request}
 
-class ProtestDetailView(generics.RetrieveAPIView):
+class ProtestDetailView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     queryset = Protest.objects.all()
     serializer_class = ProtestSerializer
     permission_classes = [permissions.AllowAny]
+    etag_fields = [
+        'pk', 'updated_at', 'views_count', 'supporters_count', 'is_supported',
+        'poster_variants', 'organizer.username',
+    ]
+    
+    def get_queryset(self):
+        return super().get_queryset().with_support_stats(self.request.user)
+    
+    def get_object(self):
+        protest = super().get_object()
+        record_view(protest)
+        return protest
     
     def get_serializer_context(self):
         return {'request': self.request}
 
-@api_view(['POST'])
+class NearbyProtestListView(generics.ListAPIView):
+    """Public protests within radius_km of (lat, lng), nearest first"""
+    serializer_class = ProtestListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+    default_radius_km = 10
+    max_results = 100
+    
+    def list(self, request, *args, **kwargs):
+        try:
+            latitude = float(request.query_params['lat'])
+            longitude = float(request.query_params['lng'])
+            radius_km = float(request.query_params.get('radius_km', self.default_radius_km))
+        except (KeyError, ValueError):
+            return Response({'error': 'lat and lng must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return Response({'error': 'lat/lng out of range'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            return Response({'error': f'radius_km must be between 0 and {MAX_RADIUS_KM}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        nearby = Protest.objects.public().near(latitude, longitude, radius_km)[:self.max_results]
+        serializer = self.get_serializer()
+        queryset = narrow_to_serializer(Protest.objects.with_support_stats(request.user), serializer)
+        protests = queryset.order_by().in_bulk([pk for pk, _ in nearby])
+        # A protest deleted since the distance query is skipped
+        found = [(protests[pk], distance) for pk, distance in nearby if pk in protests]
+        data = self.get_serializer([protest for protest, _ in found], many=True).data
+        for row, (_, distance) in zip(data, found):
+            row['distance_km'] = round(distance, 3)
+        return Response(data)
+    
+    def get_serializer_context(self):
+        return {'request': self.request}
+
+class TrendingProtestListView(generics.ListAPIView):
+    """Scheduled public protests with the most recent support, optionally in one ?city="""
+    serializer_class = ProtestListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+    default_limit = 20
+    max_limit = 100
+    
+    def list(self, request, *args, **kwargs):
+        city = request.query_params.get('city') or None
+        if city is not None and city not in dict(PAKISTAN_CITIES):
+            return Response({'error': 'Unknown city'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.max_limit:
+            return Response({'error': f'limit must be between 1 and {self.max_limit}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        ranked = top_protests(limit, city)
+        serializer = self.get_serializer()
+        queryset = narrow_to_serializer(Protest.objects.with_support_stats(request.user), serializer)
+        protests = queryset.order_by().in_bulk([pk for pk, _ in ranked])
+        # A protest deleted since the ranking query is skipped
+        found = [(protests[pk], score) for pk, score in ranked if pk in protests]
+        data = self.get_serializer([protest for protest, _ in found], many=True).data
+        for row, (_, score) in zip(data, found):
+            row['trending_score'] = round(score, 3)
+        return Response(data)
+    
+    def get_serializer_context(self):
+        return {'request': self.request}
+
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([permissions.IsAuthenticated])
 def support_protest(request, protest_id):
-    try:
-        protest = Protest.objects.get(id=protest_id)
-        support, created = Support.objects.get_or_create(
-            user=request.user,
-            protest=protest
-        )
-        if created:
-            return Response({'message': 'Protest supported successfully'})
-        else:
-            support.delete()
+    """
+    PUT supports the protest and DELETE withdraws support; both are idempotent
+    and answer with the resulting state. POST toggles, for older clients.
+    """
+    if request.method == 'POST':
+        changed = set_support(request.user, protest_id, True)
+        if changed is False:
+            set_support(request.user, protest_id, False)
             return Response({'message': 'Protest support removed'})
-    except Protest.DoesNotExist:
-        return Response({'error': 'Protest not found'}, status=404)
\ No newline at end of file
+        if changed:
+            return Response({'message': 'Protest supported successfully'})
+    else:
+        supported = request.method == 'PUT'
+        if set_support(request.user, protest_id, supported) is not None:
+            return Response({'supported': supported})
+    return Response({'error': 'Protest not found'}, status=404)
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def support_state(request):
+    """
+    The viewer's support state for a list of protests in one query, so cached
+    anonymous list pages can be personalized: {"ids": [1, 2]} ->
+    {"supported": {"1": true, "2": false}}.
+    """
+    ids = request.data.get('ids') if isinstance(request.data, dict) else None
+    if (not isinstance(ids, list) or len(ids) > SUPPORT_STATE_MAX_IDS
+            or not all(type(pk) is int for pk in ids)):
+        return Response({'error': f'ids must be a list of at most {SUPPORT_STATE_MAX_IDS} protest ids'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    supported = set(
+        Support.objects.filter(user=request.user, protest_id__in=ids).values_list('protest_id', flat=True)
+    )
+    return Response({'supported': {str(pk): pk in supported for pk in ids}})
+
+PROTEST_EXPORT_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'cause': 'cause',
+    'organizer_id': 'organizer_id',
+    'organizer': 'organizer__username',
+    'city': 'city',
+    'specific_location': 'specific_location',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'start_datetime': 'start_datetime',
+    'end_datetime': 'end_datetime',
+    'expected_participants': 'expected_participants',
+    'status': 'status',
+    'is_verified': 'is_verified',
+    'is_peaceful': 'is_peaceful',
+    'views_count': 'views_count',
+    'supporters_count': 'supporters_count',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def export_protests(request):
+    """
+    Stream every protest as NDJSON or CSV - see core/exports.py. The counter
+    columns are updated without touching updated_at, so incremental exports
+    don't pick up count-only changes.
+    """
+    return export_response(request, Protest.objects.all(), PROTEST_EXPORT_FIELDS, 'updated_at', 'protests')
+
+export_protests.batchable = False  # streams its body; see core/batch.py
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def export_supports(request):
+    """Stream every support as NDJSON or CSV - see core/exports.py"""
+    fields = {'id': 'id', 'protest_id': 'protest_id', 'user_id': 'user_id', 'created_at': 'created_at'}
+    return export_response(request, Support.objects.all(), fields, 'created_at', 'supports')
+
+export_supports.batchable = False  # streams its body; see core/batch.py
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from .fts import install_triggers
+        # SQLite drops triggers when a migration rebuilds their table, so
+        # put them back after every migrate run
+        post_migrate.connect(install_triggers, dispatch_uid='search-install-triggers')
@@ -0,0 +1,216 @@
+"""
+SQLite FTS5 index over protests and awareness posts.
+
+Each source table gets an external-content FTS5 table (the text lives only in
+the source table) kept in sync by AFTER INSERT/UPDATE/DELETE triggers, so
+admin edits, bulk_create and raw updates are all indexed. On other databases,
+or SQLite builds without FTS5, search() falls back to icontains scans.
+"""
+import html
+import re
+
+from django.db import connection
+
+from protests.models import PUBLIC_STATUSES
+
+MARK_START, MARK_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+# name -> source table, indexed columns, bm25 column weights, visibility filter
+INDEXES = {
+    'protest': {
+        'table': 'protests_protest',
+        'columns': ['title', 'description'],
+        'weights': [10.0, 1.0],
+        'visible': 'src.status IN ({})'.format(', '.join(f"'{status}'" for status in PUBLIC_STATUSES)),
+    },
+    'post': {
+        'table': 'awareness_blogpost',
+        'columns': ['title', 'excerpt', 'content'],
+        'weights': [10.0, 3.0, 1.0],
+        'visible': 'src.is_published = 1',
+    },
+}
+
+
+def fts_table(name):
+    return f'search_{name}_fts'
+
+
+_fts5_compiled = {}
+
+
+def is_available(using=connection):
+    """Whether this database can host the index (SQLite built with FTS5)"""
+    if using.vendor != 'sqlite':
+        return False
+    if using.alias not in _fts5_compiled:
+        with using.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            _fts5_compiled[using.alias] = any(row[0] == 'ENABLE_FTS5' for row in cursor.fetchall())
+    return _fts5_compiled[using.alias]
+
+
+def index_exists(using=connection):
+    if not is_available(using):
+        return False
+    with using.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [fts_table('protest')])
+        return cursor.fetchone() is not None
+
+
+def _trigger_sql(name, spec):
+    fts, table = fts_table(name), spec['table']
+    columns = ', '.join(spec['columns'])
+    new_values = ', '.join(f'new.{column}' for column in spec['columns'])
+    old_values = ', '.join(f'old.{column}' for column in spec['columns'])
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f'INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END',
+        # Only text changes reindex; counter and status updates leave the index alone
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} '
+        f'BEGIN {delete_old} {insert_new} END',
+    ]
+
+
+def create_index(using=connection):
+    """Create the FTS tables and triggers and index existing rows"""
+    if not is_available(using):
+        return
+    with using.cursor() as cursor:
+        for name, spec in INDEXES.items():
+            fts = fts_table(name)
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{', '.join(spec['columns'])}, content='{spec['table']}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            for statement in _trigger_sql(name, spec):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_index(using=connection):
+    if using.vendor != 'sqlite':
+        return
+    with using.cursor() as cursor:
+        for name in INDEXES:
+            fts = fts_table(name)
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def rebuild_index(using=connection):
+    with using.cursor() as cursor:
+        for name in INDEXES:
+            fts = fts_table(name)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def install_triggers(using='default', **kwargs):
+    from django.db import connections
+    conn = connections[using]
+    if not index_exists(conn):
+        return
+    with conn.cursor() as cursor:
+        for name, spec in INDEXES.items():
+            for statement in _trigger_sql(name, spec):
+                cursor.execute(statement)
+
+
+def match_expression(query):
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix"""
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _render_snippet(raw):
+    escaped = html.escape(raw)
+    return escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def fts_search(query, limit=20):
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    results = []
+    with connection.cursor() as cursor:
+        for name, spec in INDEXES.items():
+            fts = fts_table(name)
+            snippet_column = len(spec['columns']) - 1
+            weights = ', '.join(str(weight) for weight in spec['weights'])
+            cursor.execute(
+                f"SELECT src.id, src.title, snippet({fts}, {snippet_column}, %s, %s, '…', {SNIPPET_TOKENS}), "
+                f"bm25({fts}, {weights}) AS score "
+                f"FROM {fts} JOIN {spec['table']} src ON src.id = {fts}.rowid "
+                f"WHERE {fts} MATCH %s AND {spec['visible']} "
+                f"ORDER BY score LIMIT %s",
+                [MARK_START, MARK_END, expression, limit],
+            )
+            for pk, title, snippet, score in cursor.fetchall():
+                results.append({
+                    'type': name,
+                    'id': pk,
+                    'title': title,
+                    'snippet': _render_snippet(snippet),
+                    # bm25() is lower-is-better; flip it so clients sort descending
+                    'rank': round(-score, 6),
+                })
+    results.sort(key=lambda row: row['rank'], reverse=True)
+    return results[:limit]
+
+
+def _plain_snippet(text, query, width=120):
+    words = re.findall(r'\w+', query)
+    lowered = text.lower()
+    position = min((lowered.find(word.lower()) for word in words if word.lower() in lowered), default=0)
+    start = max(position - width // 2, 0)
+    excerpt = text[start:start + width]
+    escaped = html.escape(excerpt)
+    for word in words:
+        escaped = re.sub(f'({re.escape(html.escape(word))})', r'<mark>\1</mark>', escaped, flags=re.IGNORECASE)
+    return ('…' if start else '') + escaped + ('…' if start + width < len(text) else '')
+
+
+def icontains_search(query, limit=20):
+    from django.db.models import Q
+    from awareness.models import BlogPost
+    from protests.models import Protest
+
+    words = re.findall(r'\w+', query)
+    if not words:
+        return []
+    sources = [
+        ('protest', Protest.objects.public(), ['title', 'description'], 'description'),
+        ('post', BlogPost.objects.filter(is_published=True), ['title', 'excerpt', 'content'], 'content'),
+    ]
+    results = []
+    for name, queryset, columns, body in sources:
+        for word in words:
+            any_column = Q()
+            for column in columns:
+                any_column |= Q(**{f'{column}__icontains': word})
+            queryset = queryset.filter(any_column)
+        for pk, title, text in queryset.values_list('pk', 'title', body)[:limit]:
+            results.append({
+                'type': name,
+                'id': pk,
+                'title': title,
+                'snippet': _plain_snippet(text, query),
+                'rank': 0,
+            })
+    return results[:limit]
+
+
+def search(query, limit=20):
+    """Ranked matches across protests and posts; (backend name, results)"""
+    if index_exists():
+        return 'fts5', fts_search(query, limit)
+    return 'icontains', icontains_search(query, limit)
@@ -0,0 +1,77 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from awareness.models import BlogPost
+from protests.models import Protest
+from users.models import CustomUser
+from search.fts import fts_search, icontains_search, index_exists
+
+TOPIC_WORDS = (
+    'water electricity shortage tanker loadshedding teachers salaries hospital doctors '
+    'fuel prices inflation wheat flour farmers land rights women safety police march '
+    'students fees university transport buses roads sewage garbage union workers '
+    'pension rally peaceful dharna court verdict petition justice protest residents'
+).split()
+SYLLABLES = 'ka ra ma na ta la sa pa da ba ga ha ja wa ya za qi ro mu ne'.split()
+QUERIES = ['water', 'teachers salaries', 'peaceful march', 'univ', 'wheat flour farmers', 'protest']
+
+
+class Command(BaseCommand):
+    help = 'Compare FTS5 search against icontains on a generated corpus (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Protests and posts to generate (each)')
+        parser.add_argument('--words', type=int, default=120, help='Words per generated body')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query')
+
+    def handle(self, *args, **options):
+        if not index_exists():
+            raise CommandError('The FTS5 index is not installed on this database; run migrate on SQLite.')
+        rng = random.Random(42)
+        # A few thousand filler words plus topic words at ~1 in 50, so queries
+        # are selective the way real text is
+        filler = list({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(5000)})
+
+        def text(words):
+            return ' '.join(
+                rng.choice(TOPIC_WORDS) if rng.random() < 0.02 else rng.choice(filler)
+                for _ in range(words)
+            )
+
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(username=f'bench-{time.time_ns()}')
+            start = timezone.now() + timedelta(days=1)
+            self.stdout.write(f"Generating {options['rows']} protests and posts...")
+            Protest.objects.bulk_create((
+                Protest(
+                    title=text(6), description=text(options['words']), cause='other', organizer=user,
+                    city='lahore', specific_location='Mall Road', status='approved',
+                    start_datetime=start, end_datetime=start + timedelta(hours=2),
+                ) for _ in range(options['rows'])
+            ), batch_size=1000)
+            BlogPost.objects.bulk_create((
+                BlogPost(title=text(6), content=text(options['words']), author=user, is_published=True)
+                for _ in range(options['rows'])
+            ), batch_size=1000)
+
+            self.stdout.write(f"{'query':<24}{'fts5 ms':>12}{'icontains ms':>16}{'speedup':>10}")
+            for query in QUERIES:
+                fts_ms = self.time_query(fts_search, query, options['repeat'])
+                scan_ms = self.time_query(icontains_search, query, options['repeat'])
+                self.stdout.write(f'{query:<24}{fts_ms:>12.2f}{scan_ms:>16.2f}{scan_ms / fts_ms:>9.1f}x')
+
+            transaction.set_rollback(True)
+
+    def time_query(self, search, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            search(query, limit=20)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
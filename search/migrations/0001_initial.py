@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from search.fts import create_index
+    create_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    from search.fts import drop_index
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('protests', '0004_protest_geo_cell'),
+        ('awareness', '0003_blogpost_likes_count_blogpost_blogpost_likes_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from awareness.models import BlogPost
+from protests.models import Protest
+from users.models import CustomUser
+from .fts import index_exists, match_expression
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        start = timezone.now() + timedelta(days=1)
+        self.protest = Protest.objects.create(
+            title='Water shortage sit-in', description='Residents demand tanker schedules <b>now</b>.',
+            cause='water', organizer=self.user, city='karachi', specific_location='Korangi',
+            status='approved', start_datetime=start, end_datetime=start + timedelta(hours=2),
+        )
+        Protest.objects.create(
+            title='Hidden water protest', description='Pending review', cause='water', organizer=self.user,
+            city='karachi', specific_location='Korangi', status='pending',
+            start_datetime=start, end_datetime=start + timedelta(hours=2),
+        )
+        self.post = BlogPost.objects.create(
+            title='Your rights at a sit-in', content='Police must allow a peaceful water protest.',
+            author=self.user, is_published=True,
+        )
+
+    def search(self, q):
+        response = self.client.get(reverse('search'), {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_fts_index_is_installed_on_sqlite(self):
+        self.assertTrue(index_exists())
+
+    def test_ranked_results_with_escaped_snippets(self):
+        data = self.search('water')
+        self.assertEqual(data['backend'], 'fts5')
+        results = {(row['type'], row['id']): row for row in data['results']}
+        self.assertEqual(set(results), {('protest', self.protest.pk), ('post', self.post.pk)})
+        # Title hits are weighted above body hits
+        self.assertEqual(data['results'][0]['type'], 'protest')
+        snippet = results[('protest', self.protest.pk)]['snippet']
+        self.assertIn('&lt;b&gt;', snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.protest.title = 'Electricity outage rally'
+        self.protest.save()
+        self.assertEqual(self.search('outage')['results'][0]['id'], self.protest.pk)
+        self.post.delete()
+        self.assertEqual([row['type'] for row in self.search('peaceful')['results']], [])
+
+    def test_prefix_matching_and_query_sanitizing(self):
+        self.assertEqual(match_expression('wat"er OR'), '"wat" "er" "OR"*')
+        self.assertEqual(len(self.search('shorta')['results']), 1)
+
+    def test_icontains_fallback(self):
+        with mock.patch('search.fts.index_exists', return_value=False):
+            data = self.search('water')
+        self.assertEqual(data['backend'], 'icontains')
+        self.assertEqual(len(data['results']), 2)
+        post = next(row for row in data['results'] if row['type'] == 'post')
+        self.assertIn('<mark>water</mark>', post['snippet'])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get(reverse('search')).status_code, 400)
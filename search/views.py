@@ -0,0 +1,19 @@
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from .fts import search
+
+MAX_RESULTS = 50
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def search_view(request):
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), MAX_RESULTS))
+    except ValueError:
+        limit = 20
+    backend, results = search(query, limit)
+    return Response({'query': query, 'backend': backend, 'results': results})
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UpdatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'updates'
+
+    def ready(self):
+        from core.images import track_image_variants
+        from . import signals  # noqa: F401
+        from .models import ProtestUpdate
+        track_image_variants(ProtestUpdate, 'image')
@@ -0,0 +1,77 @@
+"""
+In-process pub/sub fan-out for live protest updates.
+
+Subscribers are asyncio queues living on the ASGI event loop, so an idle
+stream costs one queue and one suspended coroutine - no thread. publish() is
+safe to call from any thread (e.g. a sync view's post_save handler) and hands
+the event to each subscriber's loop with call_soon_threadsafe.
+
+Fan-out only reaches subscribers in the same process. With several workers,
+streams pick up updates published elsewhere by re-reading the database on
+every heartbeat (and long polls when their wait runs out), so those arrive
+late rather than never.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    def __init__(self, broker, protest_id, maxsize):
+        self.broker = broker
+        self.protest_id = protest_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A reader this far behind is cut off; it resumes from Last-Event-ID
+            self.overflowed = True
+            self.broker.unsubscribe(self)
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class UpdateBroker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, protest_id):
+        """Must be called from the event loop that will read the subscription"""
+        subscription = Subscription(self, protest_id, self.queue_size)
+        with self._lock:
+            self._subscribers[protest_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.protest_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.protest_id]
+
+    def publish(self, protest_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(protest_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Loop already closed (worker shutting down)
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, protest_id=None):
+        with self._lock:
+            if protest_id is not None:
+                return len(self._subscribers.get(protest_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+broker = UpdateBroker()
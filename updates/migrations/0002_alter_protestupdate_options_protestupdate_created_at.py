@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('updates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='protestupdate',
+            options={'ordering': ['id'], 'verbose_name': 'Protest Update', 'verbose_name_plural': 'Protest Updates'},
+        ),
+        migrations.AddField(
+            model_name='protestupdate',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
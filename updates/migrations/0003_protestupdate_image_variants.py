@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('updates', '0002_alter_protestupdate_options_protestupdate_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='protestupdate',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('protests', '0008_remove_protest_protest_approved_created_idx_and_more'),
+        ('updates', '0003_protestupdate_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='protestupdate',
+            name='protest',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='updates', to='protests.protest'),
+        ),
+        migrations.AddIndex(
+            model_name='protestupdate',
+            index=models.Index(fields=['protest', 'id'], name='update_protest_id_idx'),
+        ),
+    ]
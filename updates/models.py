@@ -12,7 +12,8 @@ class ProtestUpdate(models.Model):
         ('success', '🎉 Success Update'),
     ]
     
-    protest = models.ForeignKey(Protest, on_delete=models.CASCADE, related_name='updates')
+    # Indexed by update_protest_id_idx, which leads with protest
+    protest = models.ForeignKey(Protest, on_delete=models.CASCADE, related_name='updates', db_index=False)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     
     update_type = models.CharField(max_length=20, choices=UPDATE_TYPES, default='info', verbose_name="Update Type")
@@ -21,9 +22,23 @@ class ProtestUpdate(models.Model):
     
     # Media
     image = models.ImageField(upload_to='update_images/', blank=True, null=True, verbose_name="Update Image")
+    # Downscaled WebP/JPEG copies of the image - see core/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Important flags
     is_important = models.BooleanField(default=False, verbose_name="Important Update")
     is_verified = models.BooleanField(default=True, verbose_name="Verified Information")
     
-  
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.protest.title})"
+
+    class Meta:
+        verbose_name = "Protest Update"
+        verbose_name_plural = "Protest Updates"
+        ordering = ['id']
+        indexes = [
+            # "Updates of a protest after id N" for polling and stream replay
+            models.Index(fields=['protest', 'id'], name='update_protest_id_idx'),
+        ]
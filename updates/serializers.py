@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import ProtestUpdate
+from core.serializers import ImageVariantsField
+
+class ProtestUpdateSerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.username', read_only=True)
+    image_variants = ImageVariantsField()
+    
+    class Meta:
+        model = ProtestUpdate
+        fields = '__all__'
+        read_only_fields = ('protest', 'author')
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .broker import broker
+from .models import ProtestUpdate
+from .serializers import ProtestUpdateSerializer
+
+
+@receiver(post_save, sender=ProtestUpdate, dispatch_uid='updates-publish-created')
+def publish_created_update(sender, instance, created, **kwargs):
+    if not created:
+        return
+    # Publish only once the row is committed, so a stream replaying from the
+    # database after a reconnect can never have missed it
+    transaction.on_commit(
+        lambda: broker.publish(instance.protest_id, ProtestUpdateSerializer(instance).data)
+    )
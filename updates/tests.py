@@ -1,3 +1,139 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+
+from protests.tests import make_protest
+from users.models import CustomUser
+from .broker import UpdateBroker, broker
+from .models import ProtestUpdate
+from .views import _event_stream, protest_update_stream, protest_updates
+
+
+class BrokerTests(TestCase):
+    def test_publish_from_another_thread_reaches_only_that_protest(self):
+        local_broker = UpdateBroker()
+
+        async def scenario():
+            watched = local_broker.subscribe(1)
+            other = local_broker.subscribe(2)
+            publisher = threading.Thread(target=local_broker.publish, args=(1, {'id': 7}))
+            publisher.start()
+            event = await watched.get(timeout=1)
+            publisher.join()
+            self.assertTrue(other.queue.empty())
+            return event
+
+        self.assertEqual(asyncio.run(scenario()), {'id': 7})
+
+    def test_slow_subscriber_is_dropped(self):
+        local_broker = UpdateBroker(queue_size=1)
+
+        async def scenario():
+            subscription = local_broker.subscribe(1)
+            local_broker.publish(1, {'id': 1})
+            local_broker.publish(1, {'id': 2})
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription = asyncio.run(scenario())
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(local_broker.subscriber_count(), 0)
+
+
+class UpdateStreamTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+
+    def add_update(self, title):
+        return ProtestUpdate.objects.create(protest=self.protest, author=self.user, title=title, text='...')
+
+    async def test_resumes_from_last_event_id_then_streams_live(self):
+        first = await sync_to_async(self.add_update)('Gathering at noon')
+        missed = await sync_to_async(self.add_update)('Route changed')
+
+        stream = _event_stream(self.protest.pk, last_id=first.pk)
+        self.assertTrue((await anext(stream)).startswith('retry:'))
+        self.assertIn(f'id: {missed.pk}\n', await anext(stream))
+
+        broker.publish(self.protest.pk, {'id': missed.pk, 'title': 'duplicate'})
+        broker.publish(self.protest.pk, {'id': missed.pk + 1, 'title': 'Police arriving'})
+        self.assertIn('Police arriving', await anext(stream))
+        await stream.aclose()
+        self.assertEqual(broker.subscriber_count(self.protest.pk), 0)
+
+    async def test_heartbeat_picks_up_updates_published_on_another_worker(self):
+        stream = _event_stream(self.protest.pk, last_id=None)
+        self.assertTrue((await anext(stream)).startswith('retry:'))
+        with mock.patch('updates.views.HEARTBEAT_SECONDS', 0.01):
+            self.assertEqual(await anext(stream), ': keepalive\n\n')
+            # Never published to this process's broker, as if saved by another worker
+            update = await sync_to_async(self.add_update)('Moved to the square')
+            self.assertIn(f'id: {update.pk}\n', await anext(stream))
+            self.assertEqual(await anext(stream), ': keepalive\n\n')
+        await stream.aclose()
+
+    async def test_view_returns_event_stream(self):
+        request = AsyncRequestFactory().get('/', headers={'Last-Event-ID': '0'})
+        response = await protest_update_stream(request, protest_id=self.protest.pk)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    async def test_wsgi_request_is_refused(self):
+        response = await protest_update_stream(RequestFactory().get('/'), protest_id=self.protest.pk)
+        self.assertEqual(response.status_code, 501)
+
+    async def test_unknown_protest_is_404(self):
+        from django.http import Http404
+        with self.assertRaises(Http404):
+            await protest_update_stream(AsyncRequestFactory().get('/'), protest_id=999)
+
+
+class UpdatePollTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='organizer', password='pass12345')
+        self.protest = make_protest(self.user, city='karachi')
+
+    def add_update(self, title, is_important=False):
+        return ProtestUpdate.objects.create(
+            protest=self.protest, author=self.user, title=title, text='...', is_important=is_important,
+        )
+
+    async def poll(self, **params):
+        request = AsyncRequestFactory().get('/', params)
+        response = await protest_updates(request, protest_id=self.protest.pk)
+        return response.status_code, json.loads(response.content)
+
+    async def test_returns_new_updates_important_first(self):
+        first = await sync_to_async(self.add_update)('Gathering at noon')
+        info = await sync_to_async(self.add_update)('Bring water')
+        alert = await sync_to_async(self.add_update)('Route changed', is_important=True)
+
+        status, body = await self.poll(after_id=first.pk)
+        self.assertEqual(status, 200)
+        self.assertEqual([update['id'] for update in body['results']], [alert.pk, info.pk])
+        self.assertEqual((body['last_id'], body['has_more']), (alert.pk, False))
+
+        status, body = await self.poll(after_id=alert.pk)
+        self.assertEqual((body['results'], body['last_id']), ([], alert.pk))
+
+    async def test_long_poll_returns_when_an_update_is_published(self):
+        last = await sync_to_async(self.add_update)('Gathering at noon')
+        poll = asyncio.ensure_future(self.poll(after_id=last.pk, wait=5))
+        await asyncio.sleep(0.05)
+        self.assertFalse(poll.done())
+        created = await sync_to_async(self.add_update)('Police arriving')
+        broker.publish(self.protest.pk, {'id': created.pk})
+        status, body = await asyncio.wait_for(poll, 2)
+        self.assertEqual([update['title'] for update in body['results']], ['Police arriving'])
+        self.assertEqual(broker.subscriber_count(self.protest.pk), 0)
+
+    async def test_rejects_bad_parameters(self):
+        for params in ({'after_id': 'x'}, {'after_id': -1}, {'wait': 'nan'}):
+            with self.subTest(params=params):
+                status, _ = await self.poll(**params)
+                self.assertEqual(status, 400)
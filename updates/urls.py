@@ -4,5 +4,6 @@ from . import views
 app_name = 'updates'
 
 urlpatterns = [
-    # We'll add update URLs later
+    path('<int:protest_id>/updates/', views.protest_updates, name='list'),
+    path('<int:protest_id>/updates/stream/', views.protest_update_stream, name='stream'),
 ]
\ No newline at end of file
@@ -1,3 +1,179 @@
-from django.shortcuts import render
+import asyncio
+import json
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from protests.models import Protest
+from .broker import broker
+from .models import ProtestUpdate
+from .serializers import ProtestUpdateSerializer
+
+HEARTBEAT_SECONDS = 15
+REPLAY_LIMIT = 200
+# Polling: rows per response, and the longest a request may wait for a new one
+POLL_PAGE_SIZE = 100
+POLL_MAX_WAIT_SECONDS = 30
+
+
+def format_event(update):
+    return f"id: {update['id']}\nevent: update\ndata: {json.dumps(update, separators=(',', ':'))}\n\n"
+
+
+@sync_to_async
+def _protest_exists(protest_id):
+    return Protest.objects.filter(pk=protest_id).exists()
+
+
+@sync_to_async
+def _updates_after(protest_id, last_id, limit=REPLAY_LIMIT):
+    # A range read on update_protest_id_idx: cost follows the new rows, not the history
+    updates = ProtestUpdate.objects.filter(protest_id=protest_id, id__gt=last_id).select_related('author')
+    return ProtestUpdateSerializer(updates.order_by('id')[:limit], many=True).data
+
+
+def _last_event_id(request):
+    raw = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        return int(raw) if raw is not None else None
+    except ValueError:
+        return None
+
+
+@sync_to_async
+def _latest_update_id(protest_id):
+    latest = ProtestUpdate.objects.filter(protest_id=protest_id).order_by('-id').values_list('id', flat=True)
+    return latest.first() or 0
+
+
+async def _missed_updates(protest_id, last_id):
+    """Every update after last_id, read from the database a page at a time"""
+    while True:
+        missed = await _updates_after(protest_id, last_id)
+        for update in missed:
+            last_id = update['id']
+            yield update
+        if len(missed) < REPLAY_LIMIT:
+            return
+
+
+async def _event_stream(protest_id, last_id):
+    if last_id is None:
+        # Read before subscribing: anything newer is replayed or arrives on the queue
+        last_id = await _latest_update_id(protest_id)
+    subscription = broker.subscribe(protest_id)
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield 'retry: 3000\n\n'
+        # Subscribed before replaying, so nothing published in between is lost;
+        # duplicates are filtered on id below
+        async for update in _missed_updates(protest_id, last_id):
+            last_id = update['id']
+            yield format_event(update)
+        while not subscription.overflowed:
+            try:
+                update = await subscription.get(HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # The broker only reaches this process: updates published by
+                # another worker are picked up from the database every heartbeat
+                async for update in _missed_updates(protest_id, last_id):
+                    last_id = update['id']
+                    yield format_event(update)
+                yield ': keepalive\n\n'
+                continue
+            if update['id'] <= last_id:
+                continue
+            last_id = update['id']
+            yield format_event(update)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@require_GET
+async def protest_update_stream(request, protest_id):
+    """
+    Server-Sent Events stream of new updates for one protest.
+
+    Runs on the ASGI event loop (see protesthub/asgi.py): each open stream is a
+    suspended coroutine waiting on its broker queue. Reconnecting clients send
+    Last-Event-ID (EventSource does this automatically) and get everything they
+    missed replayed from the database first. Each heartbeat also re-reads the
+    database, so updates published on another worker arrive within
+    HEARTBEAT_SECONDS.
+
+    Under WSGI the response would be buffered in full before sending, which
+    for an endless stream is never, so those requests get 501 instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'Live updates need the ASGI server; poll /updates/?after_id= instead'}, status=501,
+        )
+    if not await _protest_exists(protest_id):
+        raise Http404('Protest not found')
+
+    response = StreamingHttpResponse(
+        _event_stream(protest_id, _last_event_id(request)),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # let nginx pass events through unbuffered
+    return response
+
+
+def _poll_params(request):
+    """(after_id, wait seconds) from the query string, or None if malformed"""
+    try:
+        after_id = int(request.GET.get('after_id', 0))
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return None
+    if after_id < 0 or not 0 <= wait < float('inf'):
+        return None
+    return after_id, min(wait, POLL_MAX_WAIT_SECONDS)
+
+
+@require_GET
+async def protest_updates(request, protest_id):
+    """
+    Updates of one protest newer than ?after_id=, for clients that can't keep
+    an event stream open.
+
+    Returns {"results": [...], "last_id": ..., "has_more": ...}: up to
+    POLL_PAGE_SIZE rows in id order, then important updates moved first.
+    Pass last_id back as after_id to continue. With ?wait=<seconds> and nothing
+    new, the request is held until an update is published or the wait runs out.
+    """
+    params = _poll_params(request)
+    if params is None:
+        return JsonResponse({'error': 'after_id must be a non-negative integer and wait a number of seconds'},
+                            status=400)
+    after_id, wait = params
+    if not await _protest_exists(protest_id):
+        raise Http404('Protest not found')
+
+    # Subscribed before querying, so an update committed in between still wakes us
+    subscription = broker.subscribe(protest_id) if wait else None
+    try:
+        updates = await _updates_after(protest_id, after_id, POLL_PAGE_SIZE + 1)
+        if not updates and subscription is not None:
+            try:
+                await subscription.get(wait)
+            except asyncio.TimeoutError:
+                # Updates published on another worker never reach this broker
+                pass
+            updates = await _updates_after(protest_id, after_id, POLL_PAGE_SIZE + 1)
+    finally:
+        if subscription is not None:
+            broker.unsubscribe(subscription)
+
+    page = updates[:POLL_PAGE_SIZE]
+    response = JsonResponse({
+        # sorted() is stable, so each group stays in id order
+        'results': sorted(page, key=lambda update: not update['is_important']),
+        'last_id': page[-1]['id'] if page else after_id,
+        'has_more': len(updates) > POLL_PAGE_SIZE,
+    })
+    response['Cache-Control'] = 'no-cache'
+    return response
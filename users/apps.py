@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from core.images import track_image_variants
+        from . import signals  # noqa: F401
+        from .models import CustomUser
+        track_image_variants(CustomUser, 'profile_image', 'banner_image')
@@ -0,0 +1,135 @@
+"""
+Token authentication with an in-process cache of token -> user.
+
+TokenAuthentication joins authtoken_token and users_customuser on every
+request. CachedTokenAuthentication keeps recent lookups in a bounded LRU with
+a TTL, so a warm authenticated request does no database work for auth.
+
+Each entry remembers the user's auth generation, a counter in the shared
+Django cache that is bumped whenever the user is saved (deactivation, profile
+edits) or one of their tokens is deleted (logout). A hit whose generation no
+longer matches is dropped, so revocation applies on the next request in every
+worker that shares CACHES['default'].
+
+A process-local default cache (LocMemCache, DummyCache) can't carry the
+generation to other workers, so with one of those every request is checked
+against the database instead. That includes the shipped settings: configure a
+shared backend (Redis, Memcached, database, file) to get the cache.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.authentication import TokenAuthentication
+
+DEFAULTS = {
+    'MAX_SIZE': 10000,
+    'TTL': 300,
+}
+GENERATION_KEY_PREFIX = 'auth-generation'
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def generations_are_shared():
+    """Whether the generation counters are seen by every worker process"""
+    return not isinstance(caches['default'], PROCESS_LOCAL_CACHES)
+
+
+def generation_key(user_id):
+    return f'{GENERATION_KEY_PREFIX}:{user_id}'
+
+
+def get_generation(user_id):
+    key = generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seeded from the clock so an evicted key can't come back with a value
+        # an old entry was stored under
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(user_id):
+    key = generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+class TokenCache:
+    """Thread-safe LRU of token key -> (user, token, generation, expires_at)"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[3] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, user, token, generation):
+        with self._lock:
+            self._entries[key] = (user, token, generation, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_user(self, user_id):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0].pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_options = {**DEFAULTS, **getattr(settings, 'TOKEN_AUTH_CACHE', {})}
+token_cache = TokenCache(_options['MAX_SIZE'], _options['TTL'])
+
+
+def invalidate_user(user_id):
+    """Drop cached credentials for a user here and, via the generation, in other workers"""
+    bump_generation(user_id)
+    token_cache.discard_user(user_id)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        if not generations_are_shared():
+            # Other workers couldn't see a revocation made here
+            return super().authenticate_credentials(key)
+        entry = token_cache.get(key)
+        if entry is not None:
+            user, token, generation, _ = entry
+            if generation == get_generation(user.pk):
+                # Each request gets its own copy so views can't mutate the cached user
+                return copy.copy(user), token
+            token_cache.discard(key)
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token, get_generation(user.pk))
+        return copy.copy(user), token
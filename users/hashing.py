@@ -0,0 +1,96 @@
+"""
+Bounded worker pool for password hashing.
+
+PBKDF2 in authenticate() and create_user() costs tens of milliseconds of CPU
+per call. Running it on request threads lets a login spike occupy every
+worker. Login and registration hand the work to this pool instead: at most
+MAX_WORKERS hashes run at once, at most MAX_QUEUE more wait, and anything
+beyond that is rejected immediately with PoolSaturated (503 to the client)
+so the remaining request capacity stays free for read traffic.
+
+Configured through settings.PASSWORD_HASHING_POOL ('MAX_WORKERS', 'MAX_QUEUE').
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+DEFAULTS = {
+    'MAX_WORKERS': 4,
+    'MAX_QUEUE': 16,
+}
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool's workers and queue are all taken"""
+
+
+class HashingPool:
+    def __init__(self, max_workers, max_queue):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hashing')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._call, fn, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+    def run(self, fn, *args, **kwargs):
+        """Run fn in the pool and wait for it (sync views)"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run_async(self, fn, *args, **kwargs):
+        """Run fn in the pool without blocking the event loop (async views)"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        with self._lock:
+            capacity = self.max_workers + self.max_queue
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': self._in_flight - self._running,
+                'saturation': round(self._in_flight / capacity, 3),
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def _call(self, fn, args, kwargs):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            # Pool threads live outside the request cycle, so apply CONN_MAX_AGE here
+            close_old_connections()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+
+_options = {**DEFAULTS, **getattr(settings, 'PASSWORD_HASHING_POOL', {})}
+hashing_pool = HashingPool(_options['MAX_WORKERS'], _options['MAX_QUEUE'])
@@ -50,6 +50,9 @@ class CustomUser(AbstractUser):
     previous_activities = models.TextField(blank=True, verbose_name="Previous Activities")
     profile_image = models.ImageField(upload_to='profiles/', blank=True, null=True, verbose_name="Logo / Profile Image")
     banner_image = models.ImageField(upload_to='profile_banners/', blank=True, null=True, verbose_name="Background Banner Image")
+    # Downscaled WebP/JPEG copies of the images above - see core/images.py
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    banner_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Pakistani ID Information (optional)
     cnic_number = models.CharField(max_length=15, blank=True, verbose_name="CNIC Number")
@@ -2,15 +2,19 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from .models import CustomUser
+from core.serializers import ImageVariantsField
 
 class UserSerializer(serializers.ModelSerializer):
+    profile_image_variants = ImageVariantsField()
+    banner_image_variants = ImageVariantsField()
+
     class Meta:
         model = CustomUser
         fields = (
             'id', 'username', 'email', 'role', 'city', 'bio', 'phone_number',
             'organization_name', 'contact_person', 'cause_focus', 'mission',
             'organization_role_type', 'previous_activities',
-            'profile_image', 'banner_image',
+            'profile_image', 'banner_image', 'profile_image_variants', 'banner_image_variants',
             'facebook_url', 'twitter_url', 'instagram_url', 'website_url',
             'responsible_person', 'undertaking_agreed'
         )
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_user, token_cache
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid='users-invalidate-cached-auth')
+def invalidate_cached_user(sender, instance, created, **kwargs):
+    # Covers deactivation as well as any profile change the cached copy would miss
+    if not created:
+        invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='users-invalidate-deleted-token')
+def invalidate_deleted_token(sender, instance, **kwargs):
+    token_cache.discard(instance.key)
+    invalidate_user(instance.user_id)
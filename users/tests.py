@@ -1,3 +1,150 @@
-from django.test import TestCase
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .authentication import TokenCache, bump_generation, token_cache
+from .hashing import HashingPool, PoolSaturated
+from .models import CustomUser
+
+
+# A backend shared between processes, as CachedTokenAuthentication needs
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='protesthub-cache-'),
+    }
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = CustomUser.objects.create_user(username='viewer', password='pass12345')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_warm_requests_skip_the_database(self):
+        url = reverse('protest-list')
+        self.client.get(url)
+        # The list itself still queries protests; auth adds nothing once warm
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_invalidates_immediately(self):
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+    def test_deactivation_invalidates_immediately(self):
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+    def test_other_worker_sees_revocation_through_generation(self):
+        self.client.get(reverse('profile'))
+        # Simulate a deactivation handled by another process: its local cache is
+        # cleared, ours is not, but the shared generation moves on
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        bump_generation(self.user.pk)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+    def test_process_local_cache_bypasses_token_cache(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.client.get(reverse('profile'))
+            self.assertEqual(len(token_cache), 0)
+            # Deactivated by another worker, with no generation bump visible here
+            CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+            self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+    def test_lru_is_bounded_and_expires(self):
+        lru = TokenCache(max_size=2, ttl=60)
+        for key in 'abc':
+            lru.set(key, self.user, None, 1)
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 2)
+        expired = TokenCache(max_size=2, ttl=-1)
+        expired.set('a', self.user, None, 1)
+        self.assertIsNone(expired.get('a'))
+
+
+class HashingPoolTests(TestCase):
+    def test_rejects_once_workers_and_queue_are_taken(self):
+        pool = HashingPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        running = pool.submit(release.wait)
+        queued = pool.submit(release.wait)
+        with self.assertRaises(PoolSaturated):
+            pool.submit(release.wait)
+        self.assertEqual(pool.stats()['saturation'], 1.0)
+        self.assertEqual(pool.stats()['rejected'], 1)
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        self.assertEqual(pool.submit(lambda: 42).result(timeout=5), 42)
+        self.assertEqual(pool.stats()['completed'], 3)
+
+    def test_saturated_pool_fails_fast_with_503(self):
+        pool = HashingPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+        pool.submit(release.wait)
+        try:
+            with mock.patch('users.views.hashing_pool', pool):
+                response = APIClient().post(reverse('login'), {'username': 'a', 'password': 'b'}, format='json')
+                async_response = self.client.post(reverse('login-async'), {'username': 'a', 'password': 'b'},
+                                                  content_type='application/json')
+        finally:
+            release.set()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(async_response.status_code, 503)
+
+    def test_stats_are_staff_only(self):
+        client = APIClient()
+        user = CustomUser.objects.create_user(username='member', password='pass12345')
+        client.force_authenticate(user)
+        self.assertEqual(client.get(reverse('hashing-pool-stats')).status_code, 403)
+        user.is_staff = True
+        user.save()
+        response = client.get(reverse('hashing-pool-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('saturation', response.data)
+
+
+# The pool's threads use their own database connections, so these need
+# committed data rather than TestCase's wrapping transaction
+class PooledAuthenticationTests(TransactionTestCase):
+    def setUp(self):
+        CustomUser.objects.create_user(username='member', password='pass12345')
+
+    def test_login_runs_through_the_pool(self):
+        response = APIClient().post(reverse('login'), {'username': 'member', 'password': 'pass12345'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['token'], Token.objects.get(user__username='member').key)
+
+        response = APIClient().post(reverse('login'), {'username': 'member', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_async_register_and_login(self):
+        response = self.client.post(reverse('register-async'), {
+            'username': 'newcomer', 'email': 'new@example.com',
+            'password': 'Str0ng-passphrase', 'password2': 'Str0ng-passphrase',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user']['username'], 'newcomer')
+
+        response = self.client.post(reverse('login-async'), {'username': 'newcomer', 'password': 'Str0ng-passphrase'},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['token'], Token.objects.get(user__username='newcomer').key)
@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
+    path('register/async/', views.register_async_view, name='register-async'),
+    path('login/async/', views.login_async_view, name='login-async'),
+    path('hashing-pool/', views.hashing_pool_stats, name='hashing-pool-stats'),
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.UserProfileView.as_view(), name='profile'),
     path('social/', include('allauth.socialaccount.urls')),
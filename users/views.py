@@ -1,10 +1,15 @@
+import json
+
 from rest_framework import generics, permissions, status
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
+from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from .hashing import PoolSaturated, hashing_pool
 from .models import CustomUser
 from .serializers import UserSerializer, RegisterSerializer, LoginSerializer
 
@@ -16,34 +21,86 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
     
+def _auth_payload(user, message):
+    token, created = Token.objects.get_or_create(user=user)
+    return {
+        'user': UserSerializer(user).data,
+        'token': token.key,
+        'message': message
+    }
+
+# _register and _login run inside the hashing pool, since create_user() and
+# authenticate() are where PBKDF2 happens; they return (payload, status)
+def _register(data):
+    serializer = RegisterSerializer(data=data)
+    if serializer.is_valid():
+        user = serializer.save()
+        return _auth_payload(user, 'User created successfully'), status.HTTP_201_CREATED
+    return serializer.errors, status.HTTP_400_BAD_REQUEST
+
+def _login(data):
+    serializer = LoginSerializer(data=data)
+    if serializer.is_valid():
+        user = serializer.validated_data['user']
+        return _auth_payload(user, 'Login successful'), status.HTTP_200_OK
+    return serializer.errors, status.HTTP_400_BAD_REQUEST
+
+BUSY_ERROR = 'Too many sign-in requests in progress, please retry shortly'
+BUSY_HEADERS = {'Retry-After': '1'}
+
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def register_view(request):
-    serializer = RegisterSerializer(data=request.data)
-    if serializer.is_valid():
-        user = serializer.save()
-        
-        token, created = Token.objects.get_or_create(user=user)
-        return Response({
-            'user': UserSerializer(user).data,
-            'token': token.key,
-            'message': 'User created successfully'
-        }, status=status.HTTP_201_CREATED)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        payload, code = hashing_pool.run(_register, request.data)
+    except PoolSaturated:
+        return Response({'error': BUSY_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers=BUSY_HEADERS)
+    return Response(payload, status=code)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def login_view(request):
-    serializer = LoginSerializer(data=request.data)
-    if serializer.is_valid():
-        user = serializer.validated_data['user']
-        token, created = Token.objects.get_or_create(user=user)
-        return Response({
-            'user': UserSerializer(user).data,
-            'token': token.key,
-            'message': 'Login successful'
-        })
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        payload, code = hashing_pool.run(_login, request.data)
+    except PoolSaturated:
+        return Response({'error': BUSY_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers=BUSY_HEADERS)
+    return Response(payload, status=code)
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        return json.loads(request.body or b'{}')
+    return request.POST
+
+async def _run_async(request, handler):
+    try:
+        data = _request_data(request)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        payload, code = await hashing_pool.run_async(handler, data)
+    except PoolSaturated:
+        return JsonResponse({'error': BUSY_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers=BUSY_HEADERS)
+    return JsonResponse(payload, status=code)
+
+@csrf_exempt
+@require_POST
+async def register_async_view(request):
+    """
+    Same contract as register_view, but the event loop only awaits the
+    hashing pool, so under ASGI a burst of sign-ups holds no request workers.
+    """
+    return await _run_async(request, _register)
+
+@csrf_exempt
+@require_POST
+async def login_async_view(request):
+    """Async counterpart of login_view - see register_async_view"""
+    return await _run_async(request, _login)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def hashing_pool_stats(request):
+    return Response(hashing_pool.stats())
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])